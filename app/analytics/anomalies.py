@@ -29,7 +29,7 @@ class AnomalyDetector:
         """
         # Validate required columns
         required_cols = ['order_date', 'order_total']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = sorted(set(required_cols).difference(df.columns))
         
         if missing_cols:
             logger.warning(f"Missing columns for anomaly detection: {missing_cols}")
@@ -303,22 +303,26 @@ class AnomalyDetector:
         median = series.median()
         mad = np.median(np.abs(series - median))
         
+        values = series.to_numpy(dtype=float)
+        labels = [idx if isinstance(idx, (datetime, pd.Timestamp)) else str(idx) for idx in series.index]
+        z_flagged = np.zeros(len(values), dtype=bool)
+        
         if mad > 0:
-            modified_z_scores = 0.6745 * (series - median) / float(mad)
+            modified_z_scores = 0.6745 * (values - median) / float(mad)
+            z_flagged = np.abs(modified_z_scores) > self.z_threshold
             
-            # Find anomalies
-            for i, (idx, value) in enumerate(series.items()):
-                z_score_val = modified_z_scores.iloc[i]
-                if abs(z_score_val) > self.z_threshold:
-                    anomalies.append({
-                        'date': idx if isinstance(idx, (datetime, pd.Timestamp)) else str(idx),
-                        'value': float(value),
-                        'metric': metric_name,
-                        'method': 'modified_z_score',
-                        'score': float(z_score_val),
-                        'threshold': self.z_threshold,
-                        'severity': 'high' if abs(z_score_val) > self.z_threshold * 1.5 else 'medium'
-                    })
+            # Build result entries only for the flagged points
+            for i in np.flatnonzero(z_flagged):
+                z_score_val = modified_z_scores[i]
+                anomalies.append({
+                    'date': labels[i],
+                    'value': float(values[i]),
+                    'metric': metric_name,
+                    'method': 'modified_z_score',
+                    'score': float(z_score_val),
+                    'threshold': self.z_threshold,
+                    'severity': 'high' if abs(z_score_val) > self.z_threshold * 1.5 else 'medium'
+                })
         
         # Method 2: IQR method
         Q1 = series.quantile(0.25)
@@ -329,23 +333,26 @@ class AnomalyDetector:
             lower_bound = Q1 - self.iqr_factor * IQR
             upper_bound = Q3 + self.iqr_factor * IQR
             
-            iqr_anomalies = series[(series < lower_bound) | (series > upper_bound)]
+            iqr_flagged = (values < lower_bound) | (values > upper_bound)
+            z_dates = {labels[i] for i in np.flatnonzero(z_flagged)}
             
-            for idx, value in iqr_anomalies.items():
+            for i in np.flatnonzero(iqr_flagged):
                 # Avoid duplicates from z-score method
-                if not any(a['date'] == (idx if isinstance(idx, (datetime, pd.Timestamp)) else str(idx)) and a['method'] == 'modified_z_score' for a in anomalies):
-                    distance_from_bounds = min(abs(value - lower_bound), abs(value - upper_bound))
-                    severity = 'high' if distance_from_bounds > IQR else 'medium'
-                    
-                    anomalies.append({
-                        'date': idx if isinstance(idx, (datetime, pd.Timestamp)) else str(idx),
-                        'value': float(value),
-                        'metric': metric_name,
-                        'method': 'iqr',
-                        'score': float(distance_from_bounds / IQR),
-                        'threshold': self.iqr_factor,
-                        'severity': severity
-                    })
+                if labels[i] in z_dates:
+                    continue
+                value = values[i]
+                distance_from_bounds = min(abs(value - lower_bound), abs(value - upper_bound))
+                severity = 'high' if distance_from_bounds > IQR else 'medium'
+                
+                anomalies.append({
+                    'date': labels[i],
+                    'value': float(value),
+                    'metric': metric_name,
+                    'method': 'iqr',
+                    'score': float(distance_from_bounds / IQR),
+                    'threshold': self.iqr_factor,
+                    'severity': severity
+                })
         
         # Sort by severity and score
         anomalies.sort(key=lambda x: (x['severity'] == 'high', abs(x['score'])), reverse=True)
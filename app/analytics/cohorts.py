@@ -17,7 +17,8 @@ class CohortAnalyzer:
     def perform_cohort_analysis(
         self, 
         df: pd.DataFrame,
-        period: str = 'M'  # M for monthly, Q for quarterly
+        period: str = 'M',  # M for monthly, Q for quarterly
+        customer_agg: Optional[pd.DataFrame] = None
     ) -> Dict[str, Any]:
         """
         Perform comprehensive cohort analysis.
@@ -25,13 +26,16 @@ class CohortAnalyzer:
         Args:
             df: DataFrame with order data (customer_id, order_date, order_total)
             period: Cohort period ('M' for monthly, 'Q' for quarterly)
+            customer_agg: Optional per-customer summary from
+                RFMAnalyzer.summarize_customers(df); its first_order column
+                replaces the acquisition-date groupby
             
         Returns:
             Dictionary containing cohort analysis results
         """
         # Validate required columns
         required_cols = ['customer_id', 'order_date', 'order_total']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = sorted(set(required_cols).difference(df.columns))
         
         if missing_cols:
             raise ValueError(f"Missing required columns for cohort analysis: {missing_cols}")
@@ -45,7 +49,7 @@ class CohortAnalyzer:
         logger.info(f"Performing {period} cohort analysis for {df_clean['customer_id'].nunique()} customers")
         
         # Create cohort table
-        cohort_table = self._create_cohort_table(df_clean, period)
+        cohort_table = self._create_cohort_table(df_clean, period, customer_agg)
         
         # Calculate retention matrix
         retention_matrix = self._calculate_retention_matrix(cohort_table)
@@ -102,10 +106,19 @@ class CohortAnalyzer:
         
         return df_clean
     
-    def _create_cohort_table(self, df: pd.DataFrame, period: str) -> pd.DataFrame:
+    def _create_cohort_table(
+        self, 
+        df: pd.DataFrame, 
+        period: str,
+        customer_agg: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
         """Create the base cohort table with customer acquisition and activity periods."""
         # Determine customer acquisition period (first order)
-        customer_acquisition = df.groupby('customer_id')['order_date'].min().reset_index()
+        if customer_agg is not None:
+            first_orders = customer_agg['first_order']
+        else:
+            first_orders = df.groupby('customer_id', observed=True)['order_date'].min()
+        customer_acquisition = first_orders.reset_index()
         customer_acquisition.columns = ['customer_id', 'acquisition_period']
         
         # Convert to period (monthly or quarterly)
@@ -200,7 +213,7 @@ class CohortAnalyzer:
     def _calculate_second_purchase_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate time to second purchase metrics."""
         # Get customer order history
-        customer_orders = df.groupby('customer_id')['order_date'].apply(list).reset_index()
+        customer_orders = df.groupby('customer_id', observed=True)['order_date'].apply(list).reset_index()
         customer_orders['order_dates'] = customer_orders['order_date'].apply(lambda x: sorted(x))
         
         # Calculate time to second purchase
@@ -222,10 +222,10 @@ class GeoAnalyzer:
             customer_col: 'nunique'
         }
         
-        geo_df = df_filtered.groupby(location_col, as_index=False).agg(agg_dict)
+        geo_df = df_filtered.groupby(location_col, as_index=False, observed=True).agg(agg_dict)
         
         # Count orders
-        order_counts = df_filtered.groupby(location_col).size().reset_index(name='orders')
+        order_counts = df_filtered.groupby(location_col, observed=True).size().reset_index(name='orders')
         geo_df = geo_df.merge(order_counts, on=location_col)
         
         # Rename columns to standard names
@@ -29,9 +29,13 @@ class KPICalculator:
         Returns:
             Dictionary containing all KPI metrics
         """
+        # Nothing to measure: skip validation and filtering entirely
+        if df.empty:
+            return self._get_empty_kpis(currency)
+        
         # Validate required columns
         required_cols = ['order_id', 'order_date', 'customer_id', 'order_total']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = sorted(set(required_cols).difference(df.columns))
         
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
@@ -160,7 +164,7 @@ class KPICalculator:
             return {}
         
         # Customer order counts and revenue
-        customer_stats = df.groupby('customer_id').agg({
+        customer_stats = df.groupby('customer_id', observed=True).agg({
             'order_id': 'nunique',
             'order_total': 'sum',
             'order_date': ['min', 'max']
@@ -296,7 +300,7 @@ class KPICalculator:
             return {}
         
         # Product performance
-        product_data = df.groupby('product_id').agg({
+        product_data = df.groupby('product_id', observed=True).agg({
             'order_total': 'sum',
             'order_id': 'nunique',
             'customer_id': 'nunique',
@@ -392,8 +396,9 @@ class KPICalculator:
         return derived
     
     def _get_empty_kpis(self, currency: Optional[str]) -> Dict[str, Any]:
-        """Return empty KPI structure for invalid data."""
+        """Return empty KPI structure for empty or invalid data."""
         return {
+            'insufficient_data': True,
             'currency': currency,
             'analysis_period': {},
             'data_summary': {
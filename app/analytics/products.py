@@ -142,7 +142,7 @@ class ProductAnalyzer:
             agg_dict['order_date'] = ['min', 'max']  # type: ignore
         
         # Group by product
-        product_metrics = df.groupby(['product_id', 'product_name']).agg(agg_dict).round(2)
+        product_metrics = df.groupby(['product_id', 'product_name'], observed=True).agg(agg_dict).round(2)
         
         # Flatten column names
         col_names = ['orders', 'customers']
@@ -206,7 +206,7 @@ class ProductAnalyzer:
         df_cat = df.copy()
         df_cat[category_col] = df_cat[category_col].fillna('Unknown')
         
-        category_stats = df_cat.groupby(category_col).agg({
+        category_stats = df_cat.groupby(category_col, observed=True).agg({
             'product_id': 'nunique',
             'order_id': 'nunique',
             'customer_id': 'nunique',
@@ -323,7 +323,7 @@ class ProductAnalyzer:
         df_lc['order_date'] = pd.to_datetime(df_lc['order_date'])
         
         # Product introduction dates
-        product_intro = df_lc.groupby('product_id')['order_date'].min()
+        product_intro = df_lc.groupby('product_id', observed=True)['order_date'].min()
         
         # Recent activity (last 30 days)
         recent_date = df_lc['order_date'].max()
@@ -335,7 +335,7 @@ class ProductAnalyzer:
         monthly_performance = df_lc.groupby([
             df_lc['order_date'].dt.to_period('M'),
             'product_id'
-        ]).agg({
+        ], observed=True).agg({
             'quantity': 'sum' if 'quantity' in df_lc.columns else 'count',
             'item_total': 'sum' if 'item_total' in df_lc.columns else 'count'
         }).reset_index()
@@ -19,7 +19,8 @@ class RFMAnalyzer:
     def calculate_rfm_scores(
         self, 
         df: pd.DataFrame, 
-        analysis_date: Optional[datetime] = None
+        analysis_date: Optional[datetime] = None,
+        customer_agg: Optional[pd.DataFrame] = None
     ) -> pd.DataFrame:
         """
         Calculate RFM scores for each customer.
@@ -32,32 +33,34 @@ class RFMAnalyzer:
         Args:
             df: DataFrame with order data (must have customer_id, order_date, order_total)
             analysis_date: Date to calculate recency from (defaults to max order date)
+            customer_agg: Optional precomputed output of summarize_customers(df);
+                skips the per-customer groupby when provided
             
         Returns:
             DataFrame with customer RFM scores and segments
         """
         # Validate required columns
         required_cols = ['customer_id', 'order_date', 'order_total']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = sorted(set(required_cols).difference(df.columns))
         
         if missing_cols:
             raise ValueError(f"Missing required columns for RFM analysis: {missing_cols}")
         
-        # Filter valid orders
-        df_clean = self._filter_valid_orders(df)
+        if customer_agg is None:
+            customer_agg = self.summarize_customers(df)
         
-        if len(df_clean) == 0:
+        if len(customer_agg) == 0:
             return pd.DataFrame()
         
         # Set analysis date
         if analysis_date is None:
-            analysis_date = pd.to_datetime(df_clean['order_date']).max()
+            analysis_date = customer_agg['last_order'].max()
         
-        logger.info(f"Calculating RFM scores for {df_clean['customer_id'].nunique()} customers")
+        logger.info(f"Calculating RFM scores for {len(customer_agg)} customers")
         logger.info(f"Analysis date: {analysis_date}")
         
         # Calculate RFM metrics per customer
-        rfm_data = self._calculate_customer_metrics(df_clean, analysis_date)
+        rfm_data = self._calculate_customer_metrics(customer_agg, analysis_date)
         
         # Calculate quintile scores (1-5 scale)
         rfm_scores = self._calculate_quintile_scores(rfm_data)
@@ -96,23 +99,40 @@ class RFMAnalyzer:
         
         return df_filtered
     
+    def summarize_customers(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate valid orders per customer.
+        
+        RFM scoring and cohort assignment both start from this summary, so it
+        can be computed once and passed to both analyzers.
+        
+        Args:
+            df: DataFrame with order data (customer_id, order_date, order_total, order_id)
+            
+        Returns:
+            DataFrame indexed by customer_id with first_order, last_order,
+            order_count, revenue and distinct_orders columns
+        """
+        df_clean = self._filter_valid_orders(df)
+        order_dates = pd.to_datetime(df_clean['order_date'])
+        
+        return df_clean.assign(order_date=order_dates).groupby('customer_id', observed=True).agg(
+            first_order=('order_date', 'min'),
+            last_order=('order_date', 'max'),
+            order_count=('order_date', 'count'),
+            revenue=('order_total', 'sum'),
+            distinct_orders=('order_id', 'nunique')
+        )
+    
     def _calculate_customer_metrics(
         self, 
-        df: pd.DataFrame, 
+        customer_agg: pd.DataFrame, 
         analysis_date: datetime
     ) -> pd.DataFrame:
-        """Calculate raw RFM metrics for each customer."""
-        # Ensure order_date is datetime
-        df['order_date'] = pd.to_datetime(df['order_date'])
-        
-        # Group by customer and calculate metrics
-        customer_metrics = df.groupby('customer_id').agg({
-            'order_date': ['max', 'count'],  # Last order date, frequency
-            'order_total': 'sum',  # Total monetary value
-            'order_id': 'nunique'  # Distinct order count (frequency alternative)
-        }).round(2)
-        
-        # Flatten column names
+        """Calculate raw RFM metrics for each customer from summarize_customers output."""
+        customer_metrics = customer_agg[['last_order', 'order_count', 'revenue', 'distinct_orders']].round(2)
+        
+        # Rename to the RFM vocabulary
         customer_metrics.columns = ['last_order_date', 'order_count', 'total_spent', 'distinct_orders']
         
         # Use distinct orders as frequency (more accurate than row count)
@@ -155,25 +175,19 @@ class RFMAnalyzer:
         
         # Calculate quintiles for each metric
         # Recency: Lower days = higher score (reverse ranking)
-        rfm_scores['r_score'] = pd.qcut(
-            rfm_scores['recency'].rank(method='first'), 
-            q=5, 
-            labels=[5, 4, 3, 2, 1]  # Reverse order for recency
-        ).astype(int)
+        rfm_scores['r_score'] = self._score_quintile(
+            rfm_scores['recency'], reverse=True
+        )
         
         # Frequency: Higher count = higher score
-        rfm_scores['f_score'] = pd.qcut(
-            rfm_scores['frequency'].rank(method='first'), 
-            q=5, 
-            labels=[1, 2, 3, 4, 5]
-        ).astype(int)
+        rfm_scores['f_score'] = self._score_quintile(
+            rfm_scores['frequency']
+        )
         
         # Monetary: Higher value = higher score
-        rfm_scores['m_score'] = pd.qcut(
-            rfm_scores['monetary'].rank(method='first'), 
-            q=5, 
-            labels=[1, 2, 3, 4, 5]
-        ).astype(int)
+        rfm_scores['m_score'] = self._score_quintile(
+            rfm_scores['monetary']
+        )
         
         # Create combined RFM score string
         rfm_scores['rfm_score'] = (
@@ -190,59 +204,87 @@ class RFMAnalyzer:
         
         return rfm_scores
     
+    def get_score_edges(self, rfm_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Quintile value bounds of a scored customer base, per RFM metric.
+        
+        The bounds are read off the fitted scores, so further values can be
+        scored with _apply_edges without re-ranking the whole customer base.
+        
+        Args:
+            rfm_df: Output of calculate_rfm_scores
+            
+        Returns:
+            Dictionary mapping recency/frequency/monetary to their bounds
+        """
+        return {
+            'recency': self._quintile_edges(rfm_df['recency'], rfm_df['r_score'], reverse=True),
+            'frequency': self._quintile_edges(rfm_df['frequency'], rfm_df['f_score']),
+            'monetary': self._quintile_edges(rfm_df['monetary'], rfm_df['m_score'])
+        }
+    
+    @staticmethod
+    def _score_quintile(values: pd.Series, reverse: bool = False) -> pd.Series:
+        """Score values 1-5 by rank quintile."""
+        codes = pd.qcut(values.rank(method='first'), q=5, labels=False)
+        scores = (5 - codes) if reverse else (codes + 1)
+        return scores.astype(int)
+    
+    @staticmethod
+    def _quintile_edges(values: pd.Series, scores: pd.Series, reverse: bool = False) -> np.ndarray:
+        """Largest value in each of the four lowest quintiles scored by _score_quintile."""
+        codes = (5 - scores) if reverse else (scores - 1)
+        return values.groupby(codes).max().reindex(range(4)).to_numpy()
+    
+    @staticmethod
+    def _apply_edges(values: pd.Series, edges: np.ndarray, reverse: bool = False) -> np.ndarray:
+        """
+        Score values 1-5 against quintile bounds from _quintile_edges.
+        
+        Matches the fitted scores for distinct values; tied values that the
+        rank-based fit split across quintiles all land in the lower one.
+        """
+        scores = np.searchsorted(edges, np.asarray(values), side='left') + 1
+        return (6 - scores) if reverse else scores
+    
     def _assign_segments(self, rfm_scores: pd.DataFrame) -> pd.DataFrame:
         """Assign customer segments based on RFM scores."""
         rfm_segments = rfm_scores.copy()
         
-        # Define segment assignment rules based on RFM score combinations
-        def assign_segment(row):
-            r, f, m = row['r_score'], row['f_score'], row['m_score']
-            
+        r = rfm_segments['r_score'].to_numpy()
+        f = rfm_segments['f_score'].to_numpy()
+        m = rfm_segments['m_score'].to_numpy()
+        
+        # Segment rules in priority order; np.select takes the first match
+        # per customer, so the order mirrors an if/elif chain
+        rules = [
             # Champions: High value across all dimensions
-            if r >= 4 and f >= 4 and m >= 4:
-                return "Champions"
-            
+            ("Champions", (r >= 4) & (f >= 4) & (m >= 4)),
             # Loyal Customers: Good recency and high frequency
-            elif r >= 3 and f >= 4 and m >= 3:
-                return "Loyal Customers"
-            
+            ("Loyal Customers", (r >= 3) & (f >= 4) & (m >= 3)),
             # Potential Loyalists: Recent customers with growth potential
-            elif r >= 4 and f >= 2 and m >= 3:
-                return "Potential Loyalists"
-            
+            ("Potential Loyalists", (r >= 4) & (f >= 2) & (m >= 3)),
             # New Customers: Recent but low frequency/monetary
-            elif r >= 4 and f <= 2 and m <= 2:
-                return "New Customers"
-            
+            ("New Customers", (r >= 4) & (f <= 2) & (m <= 2)),
             # Promising: Recent buyers with low frequency and monetary
-            elif r >= 3 and f <= 2 and m <= 2:
-                return "Promising"
-            
+            ("Promising", (r >= 3) & (f <= 2) & (m <= 2)),
             # Need Attention: Good frequency but low monetary
-            elif r >= 3 and f >= 3 and m <= 2:
-                return "Need Attention"
-            
+            ("Need Attention", (r >= 3) & (f >= 3) & (m <= 2)),
             # About to Sleep: Below average recency
-            elif r <= 2 and f >= 2 and m >= 2:
-                return "About to Sleep"
-            
+            ("About to Sleep", (r <= 2) & (f >= 2) & (m >= 2)),
             # At Risk: High value but poor recency
-            elif r <= 2 and f >= 3 and m >= 3:
-                return "At Risk"
-            
+            ("At Risk", (r <= 2) & (f >= 3) & (m >= 3)),
             # Cannot Lose Them: High value and frequency but at risk
-            elif r <= 2 and f >= 4 and m >= 4:
-                return "Cannot Lose Them"
-            
+            ("Cannot Lose Them", (r <= 2) & (f >= 4) & (m >= 4)),
             # Hibernating: Low recency and frequency but some value
-            elif r <= 2 and f <= 2 and m >= 2:
-                return "Hibernating"
-            
-            # Lost: Poor across all dimensions
-            else:
-                return "Lost"
+            ("Hibernating", (r <= 2) & (f <= 2) & (m >= 2)),
+        ]
+        names, conditions = zip(*rules)
         
-        rfm_segments['segment'] = rfm_segments.apply(assign_segment, axis=1)
+        # Lost: Poor across all dimensions
+        rfm_segments['segment'] = np.select(
+            conditions, names, default="Lost"
+        ).astype(object)
         
         # Log segment distribution
         segment_counts = rfm_segments['segment'].value_counts()
@@ -283,23 +325,39 @@ class RFMAnalyzer:
         
         summary = {}
         
-        for segment in rfm_df['segment'].unique():
-            segment_data = rfm_df[rfm_df['segment'] == segment]
+        # One grouped pass instead of a boolean mask per segment
+        grouped = rfm_df.groupby('segment', sort=False)
+        segment_stats_df = grouped.agg(
+            customer_count=('monetary', 'size'),
+            total_revenue=('monetary', 'sum'),
+            avg_monetary=('monetary', 'mean'),
+            avg_recency_days=('recency', 'mean'),
+            avg_frequency=('frequency', 'mean'),
+            avg_customer_ltv=('customer_ltv', 'mean'),
+            avg_r_score=('r_score', 'mean'),
+            avg_f_score=('f_score', 'mean'),
+            avg_m_score=('m_score', 'mean')
+        )
+        total_customers = len(rfm_df)
+        total_monetary = rfm_df['monetary'].sum()
+        
+        for segment, row in segment_stats_df.iterrows():
+            customer_count = int(row['customer_count'])
             
             segment_stats = {
-                'customer_count': len(segment_data),
-                'percentage_of_customers': (len(segment_data) / len(rfm_df)) * 100,
-                'total_revenue': float(segment_data['monetary'].sum()),
-                'avg_revenue_per_customer': float(segment_data['monetary'].mean()),
-                'percentage_of_revenue': (segment_data['monetary'].sum() / rfm_df['monetary'].sum()) * 100,
-                'avg_recency_days': float(segment_data['recency'].mean()),
-                'avg_frequency': float(segment_data['frequency'].mean()),
-                'avg_monetary': float(segment_data['monetary'].mean()),
-                'avg_customer_ltv': float(segment_data['customer_ltv'].mean()),
+                'customer_count': customer_count,
+                'percentage_of_customers': (customer_count / total_customers) * 100,
+                'total_revenue': float(row['total_revenue']),
+                'avg_revenue_per_customer': float(row['avg_monetary']),
+                'percentage_of_revenue': (row['total_revenue'] / total_monetary) * 100,
+                'avg_recency_days': float(row['avg_recency_days']),
+                'avg_frequency': float(row['avg_frequency']),
+                'avg_monetary': float(row['avg_monetary']),
+                'avg_customer_ltv': float(row['avg_customer_ltv']),
                 'rfm_scores': {
-                    'avg_r_score': float(segment_data['r_score'].mean()),
-                    'avg_f_score': float(segment_data['f_score'].mean()),
-                    'avg_m_score': float(segment_data['m_score'].mean())
+                    'avg_r_score': float(row['avg_r_score']),
+                    'avg_f_score': float(row['avg_f_score']),
+                    'avg_m_score': float(row['avg_m_score'])
                 }
             }
             
@@ -318,23 +376,10 @@ class RFMAnalyzer:
         if len(rfm_df) == 0:
             return {}
         
-        # Create pivot table for heatmap
-        heatmap_data = rfm_df.pivot_table(
-            values='customer_ltv',
-            index='f_score',
-            columns='r_score',
-            aggfunc='mean',
-            fill_value=0
-        )
-        
-        # Count of customers in each cell
-        count_data = rfm_df.pivot_table(
-            values='customer_ltv',
-            index='f_score', 
-            columns='r_score',
-            aggfunc='count',
-            fill_value=0
-        )
+        # Mean LTV and customer count per (F, R) cell from a single groupby
+        cells = rfm_df.groupby(['f_score', 'r_score'])['customer_ltv'].agg(['mean', 'count'])
+        heatmap_data = cells['mean'].unstack(fill_value=0)
+        count_data = cells['count'].unstack(fill_value=0)
         
         return {
             'value_heatmap': heatmap_data.to_dict(),
@@ -15,11 +15,13 @@ SUPPORTED_LANGUAGES = ["en", "ar"]
 USE_DYNAMIC_SCHEMA = True  # Enable dynamic schema registry (new!)
 ENABLE_CUSTOM_FIELDS = True  # Allow custom field detection
 ENABLE_PLATFORM_AUTO_DETECTION = True  # Auto-detect platform from columns
+DEBUG_MODE = os.getenv("SALLA_DEBUG", "0") == "1"  # Show debug expanders (set SALLA_DEBUG=1)
 
 # File Processing
 MAX_FILE_SIZE_MB = 500
 CHUNK_SIZE_ROWS = 10000
 MAX_ROWS_PREVIEW = 5
+DETECTION_SAMPLE_ROWS = 5000  # Rows inspected by column/data-level auto-detection
 
 # Analytics Settings
 RFM_QUINTILES = [1, 2, 3, 4, 5]
@@ -169,7 +171,10 @@ CURRENCY_FORMATTING = {
 # Arabic Digit Mapping
 ARABIC_TO_ENGLISH_DIGITS = {
     '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
-    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9'
+    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9',
+    # Persian (extended Arabic-Indic) digits
+    '۰': '0', '۱': '1', '۲': '2', '۳': '3', '۴': '4',
+    '۵': '5', '۶': '6', '۷': '7', '۸': '8', '۹': '9'
 }
 
 # Date Patterns for Auto-Detection
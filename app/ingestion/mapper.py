@@ -3,9 +3,11 @@
 import json
 import logging
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import pandas as pd
+import numpy as np
 import re
 
 try:
@@ -30,24 +32,57 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# Header normalization patterns, compiled once for every mapper instance
+_AFFIX_PREFIX_RE = re.compile(r'^(col_|column_|field_)')
+_AFFIX_SUFFIX_RE = re.compile(r'(_col|_column|_field)$')
+_SEPARATOR_RE = re.compile(r'[-\s\.]+')
+_SPECIAL_CHAR_RE = re.compile(r'[^\w\u0600-\u06FF_]')
+
+@lru_cache(maxsize=None)
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    """Parse a schema YAML file once per process; callers must not mutate it."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+@lru_cache(maxsize=4096)
+def _normalize_header(header: str) -> str:
+    """Normalize a header string; memoized since synonyms repeat across calls."""
+    # Convert to lowercase and strip whitespace
+    normalized = header.lower().strip()
+    
+    # Remove common prefixes/suffixes
+    normalized = _AFFIX_PREFIX_RE.sub('', normalized)
+    normalized = _AFFIX_SUFFIX_RE.sub('', normalized)
+    
+    # Replace common separators with underscore
+    normalized = _SEPARATOR_RE.sub('_', normalized)
+    
+    # Remove special characters except underscore
+    normalized = _SPECIAL_CHAR_RE.sub('', normalized)
+    
+    return normalized
+
 class ColumnMapper:
     """Handles automatic column detection and mapping with dynamic schema support."""
     
-    def __init__(self, platform: str = "salla"):
+    def __init__(self, platform: str = "salla", registry: Optional["SchemaRegistry"] = None):
         """
         Initialize column mapper.
         
         Args:
             platform: Platform name (salla, shopify, woocommerce, auto)
+            registry: Schema registry to use; a new one is created if None
         """
         self.platform = platform
         self.synonyms = self._load_synonyms()
         self.canonical_schema = self._load_canonical_schema()
         self.mapping_cache: Dict[str, Dict[str, str]] = {}
+        # Normalized synonym lookups per platform (None = static schema)
+        self._synonym_indexes: Dict[Optional[str], Tuple[Dict[str, List[str]], Dict[str, List[str]]]] = {}
         
         # Initialize schema registry if enabled
         if USE_DYNAMIC_SCHEMA and SCHEMA_REGISTRY_AVAILABLE:
-            self.schema_registry = SchemaRegistry()
+            self.schema_registry = registry if registry is not None else SchemaRegistry()
             self.use_dynamic = True
         else:
             self.schema_registry = None
@@ -57,8 +92,7 @@ class ColumnMapper:
         """Load header synonyms from YAML file."""
         synonyms_file = SCHEMAS_DIR / "header_synonyms.yaml"
         try:
-            with open(synonyms_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return _load_yaml(synonyms_file)
         except Exception as e:
             logger.warning(f"Could not load synonyms file: {e}")
             return {"synonyms": {}}
@@ -67,8 +101,7 @@ class ColumnMapper:
         """Load canonical schema from YAML file."""
         schema_file = SCHEMAS_DIR / "canonical_schema.yaml"
         try:
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return _load_yaml(schema_file)
         except Exception as e:
             logger.warning(f"Could not load schema file: {e}")
             return {"canonical_schema": {}}
@@ -77,21 +110,7 @@ class ColumnMapper:
         """Normalize header for better matching."""
         if not isinstance(header, str):
             header = str(header)
-            
-        # Convert to lowercase and strip whitespace
-        normalized = header.lower().strip()
-        
-        # Remove common prefixes/suffixes
-        normalized = re.sub(r'^(col_|column_|field_)', '', normalized)
-        normalized = re.sub(r'(_col|_column|_field)$', '', normalized)
-        
-        # Replace common separators with underscore
-        normalized = re.sub(r'[-\s\.]+', '_', normalized)
-        
-        # Remove special characters except underscore
-        normalized = re.sub(r'[^\w\u0600-\u06FF_]', '', normalized)
-        
-        return normalized
+        return _normalize_header(header)
     
     def calculate_match_score(
         self, 
@@ -99,13 +118,20 @@ class ColumnMapper:
         target_synonyms: List[str]
     ) -> float:
         """Calculate match score between source header and target synonyms."""
-        source_norm = self.normalize_header(source_header)
+        return self._score_normalized(
+            self.normalize_header(source_header),
+            [self.normalize_header(synonym) for synonym in target_synonyms]
+        )
+    
+    def _score_normalized(self, source_norm: str, synonym_norms: List[str]) -> float:
+        """Match score for an already-normalized header against normalized synonyms."""
+        # Exact match on any synonym wins outright - skip the fuzzy scoring
+        if source_norm in synonym_norms:
+            return 1.0
         
         best_score = 0.0
         
-        for synonym in target_synonyms:
-            synonym_norm = self.normalize_header(synonym)
-            
+        for synonym_norm in synonym_norms:
             # Exact match
             if source_norm == synonym_norm:
                 return 1.0
@@ -171,9 +197,6 @@ class ColumnMapper:
         if confidence_threshold is None:
             confidence_threshold = QUALITY_THRESHOLDS['mapping_confidence_threshold']
         
-        mappings = {}
-        confidence_scores = {}
-        
         source_columns = list(df.columns)
         
         # Auto-detect platform if set to "auto"
@@ -182,43 +205,10 @@ class ColumnMapper:
             self.platform = detected_platform
             logger.info(f"Auto-detected platform: {detected_platform}")
         
-        # Get all fields for this platform
-        all_fields = self.schema_registry.get_all_fields(self.platform)
-        
-        for canonical_field in all_fields:
-            best_match = None
-            best_score = 0.0
-            
-            # Get synonyms from schema registry
-            field_synonyms = self.schema_registry.get_field_synonyms(
-                canonical_field, 
-                self.platform
-            )
-            
-            # Add canonical field name itself
-            if canonical_field not in field_synonyms:
-                field_synonyms.append(canonical_field)
-            
-            # Test each source column
-            for source_col in source_columns:
-                score = self.calculate_match_score(source_col, field_synonyms)
-                
-                if score > best_score:
-                    best_score = score
-                    best_match = source_col
-            
-            # Store if above threshold
-            threshold = confidence_threshold or QUALITY_THRESHOLDS['mapping_confidence_threshold']
-            if best_match and best_score >= threshold:
-                mappings[canonical_field] = best_match
-                confidence_scores[canonical_field] = best_score
-            else:
-                confidence_scores[canonical_field] = best_score
-        
-        # Ensure no duplicate mappings
-        mappings = self._resolve_mapping_conflicts(mappings, confidence_scores)
-        
-        return mappings, confidence_scores
+        field_norms, synonym_lookup = self._synonym_index(self.platform)
+        return self._detect_from_index(
+            source_columns, field_norms, synonym_lookup, confidence_threshold
+        )
     
     def _auto_detect_static(
         self,
@@ -233,48 +223,151 @@ class ColumnMapper:
         if confidence_threshold is None:
             confidence_threshold = QUALITY_THRESHOLDS['mapping_confidence_threshold']
         
+        source_columns = list(df.columns)
+        
+        field_norms, synonym_lookup = self._synonym_index(None)
+        return self._detect_from_index(
+            source_columns, field_norms, synonym_lookup, confidence_threshold
+        )
+    
+    def _field_synonyms(self, platform: Optional[str]) -> Dict[str, List[str]]:
+        """Synonyms per canonical field, from the registry or the static schema."""
+        field_synonyms = {}
+        
+        if platform is None:
+            synonyms = self.synonyms.get('synonyms', {})
+            for canonical_field in CANONICAL_FIELDS.keys():
+                names = []
+                if canonical_field in synonyms:
+                    names.extend(synonyms[canonical_field].get('english', []))
+                    names.extend(synonyms[canonical_field].get('arabic', []))
+                # Add the canonical field name itself
+                names.append(canonical_field)
+                field_synonyms[canonical_field] = names
+        else:
+            for canonical_field in self.schema_registry.get_all_fields(platform):
+                # Copy: the registry hands out its own config list
+                names = list(self.schema_registry.get_field_synonyms(canonical_field, platform))
+                # Add canonical field name itself
+                if canonical_field not in names:
+                    names.append(canonical_field)
+                field_synonyms[canonical_field] = names
+        
+        return field_synonyms
+    
+    def _synonym_index(
+        self,
+        platform: Optional[str]
+    ) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Normalized synonyms per field, plus the reverse normalized-synonym lookup.
+        
+        Built once per platform, so detection resolves exact matches with one
+        dict lookup per column and only fuzzy-scores fields left unmatched.
+        """
+        if platform not in self._synonym_indexes:
+            field_norms = {}
+            synonym_lookup: Dict[str, List[str]] = {}
+            for canonical_field, names in self._field_synonyms(platform).items():
+                norms = [self.normalize_header(name) for name in names]
+                field_norms[canonical_field] = norms
+                for norm in norms:
+                    fields = synonym_lookup.setdefault(norm, [])
+                    if canonical_field not in fields:
+                        fields.append(canonical_field)
+            self._synonym_indexes[platform] = (field_norms, synonym_lookup)
+        
+        return self._synonym_indexes[platform]
+    
+    def _detect_from_index(
+        self,
+        source_columns: List[str],
+        field_norms: Dict[str, List[str]],
+        synonym_lookup: Dict[str, List[str]],
+        confidence_threshold: Optional[float]
+    ) -> Tuple[Dict[str, str], Dict[str, float]]:
+        """Map source columns to fields: exact synonym hits first, fuzzy for the rest."""
         mappings = {}
         confidence_scores = {}
         
-        source_columns = list(df.columns)
+        # Normalize source headers once instead of per (field, synonym) pair
+        source_norms = [self.normalize_header(col) for col in source_columns]
         
-        # Get synonyms for each canonical field
-        synonyms = self.synonyms.get('synonyms', {})
+        # Exact matches; the first column wins, as with the fuzzy scan
+        exact_matches: Dict[str, str] = {}
+        for col, norm in zip(source_columns, source_norms):
+            for canonical_field in synonym_lookup.get(norm, ()):
+                exact_matches.setdefault(canonical_field, col)
         
-        for canonical_field in CANONICAL_FIELDS.keys():
-            best_match = None
-            best_score = 0.0
-            
-            # Get all synonyms for this field
-            field_synonyms = []
-            if canonical_field in synonyms:
-                field_synonyms.extend(synonyms[canonical_field].get('english', []))
-                field_synonyms.extend(synonyms[canonical_field].get('arabic', []))
-            
-            # Add the canonical field name itself
-            field_synonyms.append(canonical_field)
-            
-            # Test each source column
-            for source_col in source_columns:
-                score = self.calculate_match_score(source_col, field_synonyms)
-                
-                if score > best_score:
-                    best_score = score
-                    best_match = source_col
+        fuzzy_matches = self._fuzzy_matches(
+            source_columns,
+            source_norms,
+            {field: norms for field, norms in field_norms.items() if field not in exact_matches}
+        )
+        
+        threshold = confidence_threshold or QUALITY_THRESHOLDS['mapping_confidence_threshold']
+        
+        for canonical_field in field_norms:
+            if canonical_field in exact_matches:
+                best_match, best_score = exact_matches[canonical_field], 1.0
+            else:
+                best_match, best_score = fuzzy_matches[canonical_field]
             
             # Store if above threshold
-            threshold = confidence_threshold or QUALITY_THRESHOLDS['mapping_confidence_threshold']
             if best_match and best_score >= threshold:
                 mappings[canonical_field] = best_match
-                confidence_scores[canonical_field] = best_score
-            else:
-                confidence_scores[canonical_field] = best_score
+            confidence_scores[canonical_field] = best_score
         
         # Ensure no duplicate mappings
         mappings = self._resolve_mapping_conflicts(mappings, confidence_scores)
         
         return mappings, confidence_scores
     
+    def _fuzzy_matches(
+        self,
+        source_columns: List[str],
+        source_norms: List[str],
+        field_norms: Dict[str, List[str]]
+    ) -> Dict[str, Tuple[Optional[str], float]]:
+        """Best fuzzy column match for each field, scored by _score_normalized."""
+        return {
+            field: self._best_column_match(source_columns, source_norms, norms)
+            for field, norms in field_norms.items()
+        }
+    
+    def _best_column_match(
+        self,
+        source_columns: List[str],
+        source_norms: List[str],
+        synonym_norms: List[str]
+    ) -> Tuple[Optional[str], float]:
+        """
+        Find the source column that best matches a field's synonyms.
+        
+        Args:
+            source_columns: Original source column names
+            source_norms: Normalized source column names (same order)
+            synonym_norms: Normalized synonyms for the canonical field
+            
+        Returns:
+            Tuple of (best matching column or None, best score)
+        """
+        if not source_columns:
+            return None, 0.0
+        
+        scores = np.fromiter(
+            (self._score_normalized(norm, synonym_norms) for norm in source_norms),
+            dtype=np.float64,
+            count=len(source_norms)
+        )
+        
+        # argmax keeps the first column on ties, like the previous strict '>' scan
+        best_idx = int(np.argmax(scores))
+        best_score = float(scores[best_idx])
+        if best_score <= 0.0:
+            return None, 0.0
+        return source_columns[best_idx], best_score
+    
     def _resolve_mapping_conflicts(
         self, 
         mappings: Dict[str, str], 
@@ -3,7 +3,7 @@
 import logging
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any, BinaryIO
 import re
 from datetime import datetime
 import numpy as np
@@ -23,6 +23,9 @@ from ..config import (
 
 logger = logging.getLogger(__name__)
 
+# Translation table so digit normalization is a single str.translate pass
+_ARABIC_DIGITS = str.maketrans(ARABIC_TO_ENGLISH_DIGITS)
+
 class XLSXReader:
     """Handles XLSX file reading with chunked processing and normalization."""
     
@@ -33,11 +36,7 @@ class XLSXReader:
         """Convert Arabic digits to English digits."""
         if not isinstance(text, str):
             return text
-            
-        result = text
-        for arabic, english in ARABIC_TO_ENGLISH_DIGITS.items():
-            result = result.replace(arabic, english)
-        return result
+        return text.translate(_ARABIC_DIGITS)
     
     def normalize_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize Arabic digits in all string columns."""
@@ -52,8 +51,8 @@ class XLSXReader:
         # Normalize string data
         for col in df_normalized.columns:
             if df_normalized[col].dtype == 'object':
-                df_normalized[col] = df_normalized[col].astype(str).apply(
-                    self.normalize_arabic_digits
+                df_normalized[col] = (
+                    df_normalized[col].astype(str).str.translate(_ARABIC_DIGITS)
                 )
         
         return df_normalized
@@ -129,7 +128,7 @@ class XLSXReader:
     
     def read_excel_file(
         self, 
-        file_path: Union[str, Path], 
+        file_path: Union[str, Path, BinaryIO], 
         sheet_name: Optional[str] = None,
         use_chunking: bool = True
     ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
@@ -137,24 +136,35 @@ class XLSXReader:
         Read Excel file with optional chunking and return data + metadata.
         
         Args:
-            file_path: Path to XLSX file
+            file_path: Path to XLSX file, or an in-memory file-like object
+                (e.g. BytesIO of an upload) whose ``name`` ends in .xlsx
             sheet_name: Sheet name to read (None for first sheet)
             use_chunking: Whether to use chunked reading for large files
             
         Returns:
             Tuple of (DataFrame, metadata_dict)
         """
-        file_path = Path(file_path)
-        
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        if hasattr(file_path, 'read'):
+            # File-like object: read straight from memory, no temp file needed
+            source_name = getattr(file_path, 'name', None) or 'upload.xlsx'
+            suffix = Path(source_name).suffix.lower()
+            file_size = file_path.getbuffer().nbytes if hasattr(file_path, 'getbuffer') else 0
+        else:
+            file_path = Path(file_path)
+            
+            if not file_path.exists():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            
+            source_name = str(file_path)
+            suffix = file_path.suffix.lower()
+            file_size = file_path.stat().st_size
         
-        if not file_path.suffix.lower() == '.xlsx':
-            raise ValueError(f"Unsupported file format: {file_path.suffix}")
+        if not suffix == '.xlsx':
+            raise ValueError(f"Unsupported file format: {suffix}")
         
         metadata = {
-            'file_path': str(file_path),
-            'file_size_mb': file_path.stat().st_size / (1024 * 1024),
+            'file_path': source_name,
+            'file_size_mb': file_size / (1024 * 1024),
             'read_timestamp': datetime.now(),
             'chunks_used': False,
             'total_rows': 0,
@@ -163,33 +173,35 @@ class XLSXReader:
         }
         
         try:
-            # Get sheet names
-            excel_file = pd.ExcelFile(file_path)
-            metadata['sheet_names'] = excel_file.sheet_names
-            
-            if sheet_name is None:
-                sheet_name = str(excel_file.sheet_names[0])
-            
-            # Preview read to get shape and structure
-            preview_df = pd.read_excel(
-                file_path, 
-                sheet_name=sheet_name, 
-                nrows=MAX_ROWS_PREVIEW
-            )
-            
-            metadata['columns'] = list(preview_df.columns)
-            
-            # Get total row count (approximate)
-            full_df = pd.read_excel(file_path, sheet_name=sheet_name)
-            metadata['total_rows'] = len(full_df)
+            # Open the workbook once (openpyxl read-only mode) and parse the
+            # sheet a single time instead of separate preview/full/chunk reads
+            df = None
+            with pd.ExcelFile(file_path, engine='openpyxl') as excel_file:
+                metadata['sheet_names'] = excel_file.sheet_names
+                
+                if sheet_name is None:
+                    sheet_name = str(excel_file.sheet_names[0])
+                
+                # Sheet dimensions give the row count without parsing cells
+                max_row = excel_file.book[sheet_name].max_row or 0
+                metadata['total_rows'] = max(max_row - 1, 0)
+                
+                # Chunked reading only pays off with the polars engine; with
+                # pandas a single parse is cheaper than re-reading per chunk
+                use_polars = (
+                    use_chunking and POLARS_AVAILABLE 
+                    and metadata['total_rows'] > CHUNK_SIZE_ROWS
+                )
+                if not use_polars:
+                    df = excel_file.parse(sheet_name=sheet_name)
             
-            # Decide on chunking strategy
-            if use_chunking and metadata['total_rows'] > CHUNK_SIZE_ROWS:
+            if df is None:
                 logger.info(f"Using chunked reading for {metadata['total_rows']} rows")
                 df = self._read_in_chunks(file_path, sheet_name, metadata)
                 metadata['chunks_used'] = True
-            else:
-                df = full_df
+            
+            metadata['columns'] = list(df.columns)
+            metadata['total_rows'] = len(df)
             
             # Normalize Arabic digits
             df = self.normalize_dataframe(df)
@@ -215,7 +227,7 @@ class XLSXReader:
     
     def _read_in_chunks(
         self, 
-        file_path: Path, 
+        file_path: Union[Path, BinaryIO], 
         sheet_name: str, 
         metadata: Dict[str, Any]
     ) -> pd.DataFrame:
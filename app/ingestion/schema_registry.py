@@ -11,12 +11,137 @@ Created: October 2025
 
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from fuzzywuzzy import fuzz
 
+# Type inference looks at no more than this many values of a column
+MAX_SAMPLE_SIZE = 10_000
+# Values taken from each end of a column before random sampling the middle
+_EDGE_SAMPLE_SIZE = 1_000
+# When this share of the first values is plain text the column is a string
+# column whatever the rest of the sample holds
+EARLY_TERMINATION_THRESHOLD = 0.95
+# Value types from most to least specific; a column gets the narrowest type
+# that all of its values fit
+_PRECISION = ("float", "datetime", "string")
+_STRING_LEVEL = _PRECISION.index("string")
+
+# Shapes a date value can start with; cheap to test on every sampled value,
+# unlike building a DatetimeIndex. \d also matches Arabic-Indic digits.
+_DATETIME_RE = re.compile('|'.join((
+    r'^\d{4}[-/.]\d{1,2}[-/.]\d{1,2}',    # 2024-01-31, ISO-8601
+    r'^\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}',  # 31/01/2024
+    r'^\d{1,2}\s+[A-Za-z]{3,}',           # 31 Jan 2024
+    r'^[A-Za-z]{3,}\.?\s+\d{1,2}',        # Jan 31, 2024
+)))
+MIN_DATETIME_LENGTH = 6
+MAX_DATETIME_LENGTH = 40
+# Share of the remaining values that must look like dates before they are
+# parsed for real
+_DATETIME_SHAPE_RATIO = 0.8
+
+# infer_dtype results for object columns holding native Python values;
+# "string" and "mixed" are left to the value heuristics
+_INFERRED_TYPES = {
+    "integer": "float",
+    "floating": "float",
+    "mixed-integer-float": "float",
+    "decimal": "float",
+    "datetime": "datetime",
+    "datetime64": "datetime",
+    "date": "datetime",
+    "boolean": "boolean",
+}
+
+# Column name hints, compiled once
+_DATE_NAME_RE = re.compile(r'date|time|created|updated|تاريخ|وقت')
+_NUMERIC_NAME_RE = re.compile(
+    r'total|amount|price|cost|quantity|qty|count|إجمالي|مبلغ|كمية'
+)
+_BOOLEAN_NAME_RE = re.compile(r'is_|has_|enabled|active')
+
+
+@lru_cache(maxsize=8)
+def _load_schema_file(schema_path: Path, mtime: float) -> Dict:
+    """
+    Parse a schema registry file once per path and modification time.
+    
+    Every registry built from the same file shares the result, so callers
+    must not mutate it. Editing the file changes its mtime and forces a
+    fresh parse.
+    """
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _sample_for_inference(series: pd.Series) -> pd.Series:
+    """
+    Bound the number of values type inference has to touch.
+    
+    Long columns are reduced to their head, their tail and a fixed random
+    slice of the middle, so exports sorted by date or id are still covered
+    at both ends.
+    """
+    if len(series) <= MAX_SAMPLE_SIZE:
+        return series
+    
+    middle = series.iloc[_EDGE_SAMPLE_SIZE:-_EDGE_SAMPLE_SIZE]
+    return pd.concat([
+        series.head(_EDGE_SAMPLE_SIZE),
+        series.tail(_EDGE_SAMPLE_SIZE),
+        middle.sample(MAX_SAMPLE_SIZE - 2 * _EDGE_SAMPLE_SIZE, random_state=0)
+    ])
+
+
+def _classify_values(values: pd.Series) -> np.ndarray:
+    """Index into _PRECISION of the most specific type each value parses as."""
+    levels = np.full(len(values), _STRING_LEVEL, dtype=np.int8)
+    
+    numeric = pd.to_numeric(values, errors='coerce').notna().to_numpy()
+    levels[numeric] = _PRECISION.index("float")
+    
+    rest = np.flatnonzero(~numeric)
+    if len(rest) > 0:
+        # Only values shaped like dates are handed to the date parser, and
+        # only when most of them are
+        text = values.iloc[rest].astype(str)
+        lengths = text.str.len()
+        shaped = (
+            lengths.between(MIN_DATETIME_LENGTH, MAX_DATETIME_LENGTH)
+            & text.str.match(_DATETIME_RE)
+        ).to_numpy()
+        
+        if shaped.mean() >= _DATETIME_SHAPE_RATIO:
+            try:
+                dates = pd.to_datetime(values.iloc[rest[shaped]], errors='coerce').notna().to_numpy()
+                levels[rest[shaped][dates]] = _PRECISION.index("datetime")
+            except (TypeError, ValueError):
+                pass
+    
+    return levels
+
+
+def _resolve_type(levels: np.ndarray, confidence: float) -> Tuple[str, float]:
+    """
+    Merge per-value levels into one column type.
+    
+    Levels covering no more than (1 - confidence) of the values are treated
+    as noise. Numbers and dates do not contain each other, so a column that
+    still mixes levels after that falls back to string.
+    """
+    shares = np.bincount(levels, minlength=len(_PRECISION)) / len(levels)
+    kept = np.flatnonzero(shares > 1 - confidence)
+    
+    if len(kept) == 1 and kept[0] != _STRING_LEVEL:
+        return _PRECISION[kept[0]], float(shares[kept[0]])
+    
+    return "string", 0.6
+
 
 class SchemaRegistry:
     """
@@ -49,12 +174,12 @@ class SchemaRegistry:
         self.schema_path = Path(schema_path)
         self.schemas = self._load_schemas()
         self.custom_fields: Dict[str, Dict] = {}
+        self._platform_synonyms: Optional[Dict[str, List[List[str]]]] = None
         
     def _load_schemas(self) -> Dict:
         """Load schema definitions from JSON file."""
         try:
-            with open(self.schema_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_schema_file(self.schema_path, self.schema_path.stat().st_mtime)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Schema registry not found at {self.schema_path}. "
@@ -116,36 +241,28 @@ class SchemaRegistry:
             return "salla"  # Default
         
         scores = {}
-        platforms = self.schemas.get("platforms", {})
+        column_names = [column.lower() for column in columns]
+        column_set = set(column_names)
         
-        for platform_name, platform_config in platforms.items():
+        # Platforms are tried in schema order, Salla first
+        for platform_name, required_synonyms in self._detection_synonyms().items():
             score = 0
-            total_fields = 0
-            core_fields = platform_config.get("core_fields", {})
             
-            # Check each core field's synonyms against columns
-            for field_name, field_config in core_fields.items():
-                if not field_config.get("required", False):
-                    continue  # Only check required fields for platform detection
-                
-                total_fields += 1
-                synonyms = field_config.get("synonyms", [])
-                
-                # Check if any synonym matches any column
-                for synonym in synonyms:
-                    for column in columns:
-                        # Fuzzy match
-                        similarity = fuzz.ratio(
-                            synonym.lower(),
-                            column.lower()
-                        )
-                        if similarity >= 80:  # 80% match threshold
-                            score += 1
-                            break
+            # Count each required field once when any synonym matches a column
+            for synonyms in required_synonyms:
+                if column_set.intersection(synonyms) or any(
+                    fuzz.ratio(synonym, column) >= 80  # 80% match threshold
+                    for synonym in synonyms
+                    for column in column_names
+                ):
+                    score += 1
             
             # Calculate percentage of required fields matched
-            if total_fields > 0:
-                scores[platform_name] = score / total_fields
+            if required_synonyms:
+                scores[platform_name] = score / len(required_synonyms)
+                # Ties go to the earlier platform, so a full match cannot be beaten
+                if scores[platform_name] == 1.0:
+                    return platform_name
         
         if not scores:
             return "salla"  # Default
@@ -159,6 +276,20 @@ class SchemaRegistry:
         else:
             return "custom"  # Unknown platform
     
+    def _detection_synonyms(self) -> Dict[str, List[List[str]]]:
+        """Lowercased synonyms of each required field, per platform, built once."""
+        if self._platform_synonyms is None:
+            self._platform_synonyms = {
+                platform_name: [
+                    [synonym.lower() for synonym in field_config.get("synonyms", [])]
+                    for field_config in platform_config.get("core_fields", {}).values()
+                    # Only check required fields for platform detection
+                    if field_config.get("required", False)
+                ]
+                for platform_name, platform_config in self.schemas.get("platforms", {}).items()
+            }
+        return self._platform_synonyms
+    
     def get_required_fields(self, platform: str = "salla") -> List[str]:
         """
         Get list of required field names for platform.
@@ -273,16 +404,20 @@ class SchemaRegistry:
     def suggest_field_type(
         self, 
         column_name: str, 
-        sample_data: pd.Series
+        sample_data: pd.Series,
+        confidence: float = 0.8
     ) -> Tuple[str, float]:
         """
         Intelligently detect field type from sample data.
         
         Analyzes column name and sample values to suggest appropriate type.
+        Columns longer than MAX_SAMPLE_SIZE are inferred from a sample.
         
         Args:
             column_name: Name of the column
             sample_data: Pandas series with sample values
+            confidence: Share of values a type must explain; types seen in
+                no more than (1 - confidence) of the values are ignored
             
         Returns:
             Tuple of (suggested_type, confidence_score)
@@ -294,7 +429,7 @@ class SchemaRegistry:
             >>> print(field_type)  # "datetime"
         """
         # Remove nulls
-        clean_data = sample_data.dropna()
+        clean_data = _sample_for_inference(sample_data).dropna()
         
         if len(clean_data) == 0:
             return "string", 0.5  # Default to string with low confidence
@@ -303,10 +438,7 @@ class SchemaRegistry:
         name_lower = column_name.lower()
         
         # DateTime patterns
-        date_patterns = [
-            r'date', r'time', r'created', r'updated', r'تاريخ', r'وقت'
-        ]
-        if any(re.search(pattern, name_lower) for pattern in date_patterns):
+        if _DATE_NAME_RE.search(name_lower):
             # Try parsing as date
             try:
                 pd.to_datetime(clean_data.head(5))
@@ -315,11 +447,7 @@ class SchemaRegistry:
                 pass
         
         # Numeric patterns
-        numeric_patterns = [
-            r'total', r'amount', r'price', r'cost', r'quantity', 
-            r'qty', r'count', r'إجمالي', r'مبلغ', r'كمية'
-        ]
-        if any(re.search(pattern, name_lower) for pattern in numeric_patterns):
+        if _NUMERIC_NAME_RE.search(name_lower):
             # Check if values are numeric
             try:
                 pd.to_numeric(clean_data.head(5))
@@ -328,36 +456,36 @@ class SchemaRegistry:
                 pass
         
         # Boolean patterns
-        boolean_patterns = [r'is_', r'has_', r'enabled', r'active']
-        if any(re.search(pattern, name_lower) for pattern in boolean_patterns):
+        if _BOOLEAN_NAME_RE.search(name_lower):
             unique_vals = set(str(v).lower() for v in clean_data.unique())
             boolean_vals = {'true', 'false', 'yes', 'no', '1', '0', 't', 'f'}
             if unique_vals.issubset(boolean_vals):
                 return "boolean", 0.9
         
-        # Analyze actual values
-        try:
-            # Try numeric conversion
-            numeric_vals = pd.to_numeric(clean_data, errors='coerce')
-            numeric_ratio = numeric_vals.notna().sum() / len(clean_data)
-            
-            if numeric_ratio > 0.8:
-                return "float", numeric_ratio
-        except:
-            pass
-        
-        # Try datetime conversion
-        try:
-            date_vals = pd.to_datetime(clean_data, errors='coerce')
-            date_ratio = date_vals.notna().sum() / len(clean_data)
-            
-            if date_ratio > 0.8:
-                return "datetime", date_ratio
-        except:
-            pass
-        
-        # Default to string
-        return "string", 0.6
+        # Typed columns already say what they hold (after the name hints,
+        # so 0/1 flags and epoch timestamps keep their named type)
+        if pd.api.types.is_bool_dtype(clean_data):
+            return "boolean", 1.0
+        if pd.api.types.is_numeric_dtype(clean_data):
+            return "float", 1.0
+        if pd.api.types.is_datetime64_any_dtype(clean_data):
+            return "datetime", 1.0
+        
+        if pd.api.types.is_object_dtype(clean_data):
+            inferred = _INFERRED_TYPES.get(pd.api.types.infer_dtype(clean_data, skipna=False))
+            if inferred is not None:
+                return inferred, 1.0
+        
+        # Analyze actual values: classify each by the most specific type it
+        # parses as, then merge up the hierarchy
+        head = clean_data.head(_EDGE_SAMPLE_SIZE)
+        if len(head) < len(clean_data):
+            head_levels = _classify_values(head)
+            # Nothing is wider than string, so a text head settles the column
+            if np.mean(head_levels == _STRING_LEVEL) >= EARLY_TERMINATION_THRESHOLD:
+                return "string", 0.6
+        
+        return _resolve_type(_classify_values(clean_data), confidence)
     
     def get_field_synonyms(self, field_name: str, platform: str = "salla") -> List[str]:
         """
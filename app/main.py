@@ -16,9 +16,9 @@ warnings.filterwarnings('ignore', message='.*get_group.*')
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.config import PAGE_CONFIG, DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES
+from app.config import PAGE_CONFIG, DEFAULT_LANGUAGE, SUPPORTED_LANGUAGES, DEBUG_MODE
 from app.ui.components import setup_page, get_translator, set_language
-from app.utils.mobile import inject_screen_detector, is_mobile, show_mobile_tip
+from app.utils.mobile import inject_screen_detector, show_mobile_tip
 
 # Configure logging
 logging.basicConfig(
@@ -64,8 +64,7 @@ inject_screen_detector()
 def main():
     """Main application entry point."""
     # Show mobile tip if on mobile device
-    if is_mobile():
-        show_mobile_tip()
+    show_mobile_tip()
     
     # Setup page with language selector
     setup_page()
@@ -196,6 +195,13 @@ def main():
         key="page_selector"
     )
     
+    # Debug panels are off for regular users; SALLA_DEBUG=1 flips the default
+    st.sidebar.checkbox(
+        "Debug mode" if st.session_state.language == 'en' else "وضع التصحيح",
+        value=DEBUG_MODE,
+        key="debug_mode"
+    )
+    
     # Load the selected page
     if page == "upload":
         from app.ui.pages.upload import render_upload_page
@@ -6,6 +6,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 import logging
 
+from app.config import DEBUG_MODE
+
 logger = logging.getLogger(__name__)
 
 # RTL support
@@ -17,6 +19,21 @@ except ImportError:
     RTL_AVAILABLE = False
     logger.warning("arabic-reshaper and python-bidi not available. Arabic RTL support disabled.")
 
+# Partial reruns: st.fragment (1.37+) / st.experimental_fragment (1.33+).
+# On older Streamlit the decorator is a no-op and the function renders inline.
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+FRAGMENT_AVAILABLE = _fragment is not None
+
+def fragment(func: Callable) -> Callable:
+    """Render ``func`` as a Streamlit fragment when supported.
+    
+    Fragments rerun independently of the rest of the page, so widgets and
+    output inside them aren't rebuilt on every unrelated interaction.
+    """
+    if FRAGMENT_AVAILABLE:
+        return _fragment(func)  # type: ignore
+    return func
+
 
 # ============================================================================
 # Page Protection & Error Handling
@@ -72,6 +89,17 @@ def require_data(func: Callable) -> Callable:
         return func(*args, **kwargs)
     return wrapper
 
+def is_debug_mode() -> bool:
+    """Check whether debug panels should be rendered.
+    
+    Debug expanders still execute their bodies when collapsed, so pages
+    should skip them entirely unless debugging is switched on.
+    
+    Returns:
+        True if SALLA_DEBUG=1 or debug mode was enabled in the session
+    """
+    return bool(st.session_state.get('debug_mode', DEBUG_MODE))
+
 
 # ============================================================================
 # Translation & Localization
@@ -141,7 +141,7 @@ def _show_insufficient_data_message(t):
             st.metric("Date Range", f"{date_range_months:.1f} months")
         
         # Check repeat purchase rate
-        customer_order_counts = df_clean.groupby('customer_id')['order_id'].nunique()
+        customer_order_counts = df_clean.groupby('customer_id', observed=True)['order_id'].nunique()
         repeat_customers = (customer_order_counts > 1).sum()
         repeat_rate = (repeat_customers / total_customers * 100) if total_customers > 0 else 0
         
@@ -2,10 +2,39 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 
 from app.ui.components import get_translator, format_currency, format_number
 
+
+@st.cache_data(show_spinner=False)
+def _build_products_table(top_products: list, currency_str: str):
+    """Build the formatted product details table as an Arrow table.
+    
+    Cached so reruns hand Streamlit a ready Arrow table instead of
+    re-formatting and re-converting the DataFrame every time.
+    
+    Args:
+        top_products: Top product records (dicts)
+        currency_str: Currency prefix for revenue values
+        
+    Returns:
+        pyarrow.Table with pre-formatted string columns
+    """
+    import pyarrow as pa
+    
+    df_products = pd.DataFrame(top_products)
+    
+    # Build the formatted frame in one go instead of assigning columns in place
+    display_cols = {col: df_products[col] for col in df_products.columns}
+    display_cols['revenue'] = currency_str + df_products['revenue'].map('{:,.2f}'.format)
+    for col in ('quantity', 'customers'):
+        if col in df_products.columns:
+            display_cols[col] = df_products[col].astype('int64').map('{:,d}'.format)
+    
+    return pa.Table.from_pandas(pd.DataFrame(display_cols), preserve_index=False)
+
+
 def render_products_page():
     """Render the products analysis page."""
     language = st.session_state.language
@@ -38,21 +67,22 @@ def render_products_page():
     top_products = product_results.get('top_products_by_revenue', [])
     
     if top_products and len(top_products) > 0:
-        df_products = pd.DataFrame(top_products[:10])
+        top10 = top_products[:10]
+        names = [row['product_name'] for row in top10]
+        revenues = [row['revenue'] for row in top10]
         
-        # Show revenue chart
-        fig = px.bar(
-            df_products,
-            x='revenue',
-            y='product_name',
+        # Show revenue chart (graph_objects directly, skipping Plotly Express introspection)
+        fig = go.Figure(go.Bar(
+            x=revenues,
+            y=names,
             orientation='h',
-            color='revenue',
-            color_continuous_scale='Greens',
-            labels={'revenue': t['products']['revenue'], 'product_name': t['products']['product_name']},
-            title=t['products']['top_products']
-        )
+            marker=dict(color=revenues, colorscale='Greens')
+        ))
         
         fig.update_layout(
+            title=t['products']['top_products'],
+            xaxis_title=t['products']['revenue'],
+            yaxis_title=t['products']['product_name'],
             yaxis={'categoryorder': 'total ascending'},
             height=500,
             showlegend=False
@@ -62,12 +92,6 @@ def render_products_page():
         
         # Show data table with more details
         st.markdown("### Product Performance Details")
-        display_df = df_products.copy()
-        display_df['revenue'] = display_df['revenue'].apply(lambda x: f"{currency_str}{x:,.2f}")
-        if 'quantity' in display_df.columns:
-            display_df['quantity'] = display_df['quantity'].apply(lambda x: f"{int(x):,}")
-        if 'customers' in display_df.columns:
-            display_df['customers'] = display_df['customers'].apply(lambda x: f"{int(x):,}")
-        st.dataframe(display_df, use_container_width=True)
+        st.dataframe(_build_products_table(top10, currency_str), use_container_width=True)
     else:
         st.warning("No product data available to display.")
\ No newline at end of file
@@ -2,29 +2,165 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List, Tuple
 
 from app.ui.components import (
     get_translator, format_number, format_currency, 
-    format_percentage, show_metric_card
+    format_percentage, show_metric_card, is_debug_mode
 )
 from app.utils.mobile import (
     is_mobile, get_responsive_columns, mobile_friendly_chart_config
 )
 
+
+def _trend_xy(trend_items: tuple) -> Tuple[List[str], np.ndarray]:
+    """Split monthly trend items into x (periods) and y (revenue) arrays.
+    
+    Args:
+        trend_items: Sorted tuple of (period, metrics dict) pairs
+        
+    Returns:
+        Tuple of (periods, revenues)
+    """
+    periods = [period for period, _ in trend_items]
+    revenues = np.fromiter(
+        (values.get('revenue', 0) for _, values in trend_items),
+        dtype=np.float64,
+        count=len(trend_items)
+    )
+    return periods, revenues
+
+
+@st.cache_data(show_spinner=False)
+def _build_trend_fig(trend_items: tuple, title: str, color: str, height: int,
+                     xaxis_title: str = ""):
+    """Build the monthly revenue trend chart.
+    
+    Args:
+        trend_items: Sorted tuple of (period, metrics dict) pairs
+        title: Trace name and y-axis title
+        color: Line color
+        height: Chart height in pixels
+        xaxis_title: X-axis title
+        
+    Returns:
+        Plotly figure (memoized on the argument values)
+    """
+    import plotly.graph_objects as go  # Lazy: only needed once a chart is drawn
+    
+    periods, revenues = _trend_xy(trend_items)
+    
+    # WebGL trace keeps multi-year trends cheap to render
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=periods,
+        y=revenues,
+        mode='lines+markers',
+        name=title,
+        line=dict(color=color, width=3)
+    ))
+    
+    fig.update_layout(
+        xaxis_title=xaxis_title,
+        yaxis_title=title,
+        hovermode='x unified',
+        height=height
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _build_pie_fig(values: tuple, names: tuple, height: int):
+    """Build the new vs returning customer pie chart.
+    
+    Args:
+        values: Slice values
+        names: Slice labels
+        height: Chart height in pixels
+        
+    Returns:
+        Plotly figure (memoized on the argument values)
+    """
+    import plotly.express as px
+    
+    fig = px.pie(
+        values=list(values),
+        names=list(names),
+        color_discrete_sequence=['#4CAF50', '#2196F3']
+    )
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=height)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _build_revdist_fig(items: tuple, height: int):
+    """Build the order value distribution bar chart.
+    
+    Args:
+        items: Tuple of (bucket, order count) pairs
+        height: Chart height in pixels
+        
+    Returns:
+        Plotly figure (memoized on the argument values)
+    """
+    import plotly.graph_objects as go
+    
+    names, values = zip(*items)
+    fig = go.Figure(go.Bar(
+        x=names,
+        y=values,
+        marker=dict(color=values, colorscale='Greens')
+    ))
+    
+    fig.update_layout(height=height, showlegend=False)
+    return fig
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _df_summary(data_key: tuple, _df: pd.DataFrame) -> Dict[str, Any]:
+    """Compute the headline stats shown in the Data Details expander.
+    
+    Args:
+        data_key: Key identifying the cleaned data (st.session_state.df_clean_key)
+        _df: Cleaned order data (not hashed; data_key stands in for it)
+        
+    Returns:
+        Dictionary with row count, date range, unique customers/orders and revenue
+    """
+    # One agg call instead of five separate column reductions
+    stats = _df.agg({
+        'order_date': ['min', 'max'],
+        'customer_id': 'nunique',
+        'order_id': 'nunique',
+        'order_total': 'sum'
+    })
+    
+    return {
+        'rows': len(_df),
+        'date_min': stats.loc['min', 'order_date'],
+        'date_max': stats.loc['max', 'order_date'],
+        'customers': int(stats.loc['nunique', 'customer_id']),
+        'orders': int(stats.loc['nunique', 'order_id']),
+        'revenue': float(stats.loc['sum', 'order_total'])
+    }
+
+
 def render_summary_page():
     """Render the executive summary page."""
     language = st.session_state.language
     t = get_translator(language)
     
+    debug = is_debug_mode()
+    
     # Debug: Show session state status
-    with st.expander("🔧 Debug: Session State", expanded=False):
-        st.write(f"**data_loaded**: {st.session_state.get('data_loaded', 'NOT SET')}")
-        st.write(f"**analysis_results keys**: {list(st.session_state.get('analysis_results', {}).keys())}")
-        st.write(f"**df_clean exists**: {'df_clean' in st.session_state}")
-        st.write(f"**current_file**: {st.session_state.get('current_file', 'NOT SET')}")
+    if debug:
+        with st.expander("🔧 Debug: Session State", expanded=False):
+            st.write(f"**data_loaded**: {st.session_state.get('data_loaded', 'NOT SET')}")
+            st.write(f"**analysis_results keys**: {list(st.session_state.get('analysis_results', {}).keys())}")
+            st.write(f"**df_clean exists**: {'df_clean' in st.session_state}")
+            st.write(f"**current_file**: {st.session_state.get('current_file', 'NOT SET')}")
     
     if not st.session_state.get('data_loaded', False):
         st.warning(t['errors']['no_data'])
@@ -43,19 +179,28 @@ def render_summary_page():
         st.error(t['errors']['no_analysis'])
         return
     
+    # Resolve layout once per render instead of at every call site
+    mobile = is_mobile()
+    num_cols = get_responsive_columns(desktop_cols=4, tablet_cols=2, mobile_cols=1)
+    num_chart_cols = get_responsive_columns(desktop_cols=2, tablet_cols=1, mobile_cols=1)
+    chart_config = mobile_friendly_chart_config()
+    trend_height = 300 if mobile else 400
+    chart_height = 250 if mobile else 350
+    
     # Debug: Show data that was analyzed
-    if 'df_clean' in st.session_state:
+    if debug and 'df_clean' in st.session_state:
         df_clean = st.session_state.df_clean
         with st.expander("📊 Data Details", expanded=False):
             # Get currency from KPIs
             currency = kpis.get('currency')
             currency_str = f"{currency} " if currency else ""
             
-            st.write(f"**Total Rows Analyzed**: {len(df_clean):,}")
-            st.write(f"**Date Range**: {df_clean['order_date'].min()} to {df_clean['order_date'].max()}")
-            st.write(f"**Unique Customers**: {df_clean['customer_id'].nunique():,}")
-            st.write(f"**Unique Orders**: {df_clean['order_id'].nunique():,}")
-            st.write(f"**Total Revenue**: {currency_str}{df_clean['order_total'].sum():,.2f}")
+            stats = _df_summary(st.session_state.df_clean_key, df_clean)
+            st.write(f"**Total Rows Analyzed**: {stats['rows']:,}")
+            st.write(f"**Date Range**: {stats['date_min']} to {stats['date_max']}")
+            st.write(f"**Unique Customers**: {stats['customers']:,}")
+            st.write(f"**Unique Orders**: {stats['orders']:,}")
+            st.write(f"**Total Revenue**: {currency_str}{stats['revenue']:,.2f}")
     
     # Key metrics row
     st.markdown(f"## {t['summary']['key_metrics']}")
@@ -63,11 +208,10 @@ def render_summary_page():
     # Get currency from KPIs for formatting
     currency = kpis.get('currency')
     
-    # Responsive columns: 4 on desktop, 2 on tablet, 1 on mobile
-    num_cols = get_responsive_columns(desktop_cols=4, tablet_cols=2, mobile_cols=1)
-    cols = st.columns(num_cols)
+    customer_metrics = kpis.get('customer_metrics', {})
     
-    # Metrics data
+    # Primary and secondary metrics share one responsive grid:
+    # 4 columns on desktop, 2 on tablet, 1 on mobile
     metrics_data = [
         {
             'label': t['summary']['total_revenue'],
@@ -79,112 +223,75 @@ def render_summary_page():
         },
         {
             'label': t['summary']['total_customers'],
-            'value': format_number(kpis.get('customer_metrics', {}).get('total_customers', 0), language, decimals=0)
+            'value': format_number(customer_metrics.get('total_customers', 0), language, decimals=0)
         },
         {
             'label': t['summary']['avg_order_value'],
             'value': format_currency(kpis.get('order_metrics', {}).get('average_order_value', 0), currency=currency, language=language)
+        },
+        {
+            'label': t['summary']['repeat_rate'],
+            'value': format_percentage(customer_metrics.get('repeat_purchase_rate', 0) * 100, language)
+        },
+        {
+            'label': t['summary']['avg_ltv'],
+            'value': format_currency(customer_metrics.get('avg_customer_ltv', 0), currency=currency, language=language)
+        },
+        {
+            'label': t['summary']['new_customers'],
+            'value': format_number(customer_metrics.get('new_customers', 0), language, decimals=0)
+        },
+        {
+            'label': t['summary']['returning_customers'],
+            'value': format_number(customer_metrics.get('returning_customers', 0), language, decimals=0)
         }
     ]
     
-    # Display metrics in responsive columns
+    cols = st.columns(num_cols)
+    
     for idx, metric in enumerate(metrics_data):
-        col_idx = idx % num_cols
-        with cols[col_idx]:
+        with cols[idx % num_cols]:
             show_metric_card(
                 label=metric['label'],
                 value=metric['value'],
                 language=language
             )
     
-    # Secondary metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        repeat_rate = kpis.get('customer_metrics', {}).get('repeat_purchase_rate', 0) * 100
-        show_metric_card(
-            label=t['summary']['repeat_rate'],
-            value=format_percentage(repeat_rate, language),
-            language=language
-        )
-    
-    with col2:
-        avg_ltv = kpis.get('customer_metrics', {}).get('avg_customer_ltv', 0)
-        show_metric_card(
-            label=t['summary']['avg_ltv'],
-            value=format_currency(avg_ltv, currency=currency, language=language),
-            language=language
-        )
-    
-    with col3:
-        new_customers = kpis.get('customer_metrics', {}).get('new_customers', 0)
-        show_metric_card(
-            label=t['summary']['new_customers'],
-            value=format_number(new_customers, language, decimals=0),
-            language=language
-        )
-    
-    with col4:
-        returning_customers = kpis.get('customer_metrics', {}).get('returning_customers', 0)
-        show_metric_card(
-            label=t['summary']['returning_customers'],
-            value=format_number(returning_customers, language, decimals=0),
-            language=language
-        )
-    
     # Revenue trends chart
     st.markdown(f"## {t['summary']['revenue_trends']}")
     
     trend_data = kpis.get('trend_metrics', {}).get('monthly_trends', {})
     
     if trend_data:
-        # Convert dict to dataframe
-        df_trends = pd.DataFrame.from_dict(trend_data, orient='index')
-        df_trends.index.name = 'period'
-        df_trends = df_trends.reset_index()
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df_trends['period'],
-            y=df_trends['revenue'],
-            mode='lines+markers',
-            name=t['summary']['revenue'],
-            line=dict(color='#2E8B57', width=3)
-        ))
-        
-        fig.update_layout(
-            xaxis_title=t['summary']['month'],
-            yaxis_title=t['summary']['revenue'],
-            hovermode='x unified',
-            height=300 if is_mobile() else 400
+        fig = _build_trend_fig(
+            tuple(sorted(trend_data.items())),
+            title=t['summary']['revenue'],
+            color='#2E8B57',
+            height=trend_height,
+            xaxis_title=t['summary']['month']
         )
         
-        st.plotly_chart(fig, use_container_width=True, config=mobile_friendly_chart_config())
+        st.plotly_chart(fig, use_container_width=True, config=chart_config)
     
     # Distribution charts - responsive layout
-    num_chart_cols = get_responsive_columns(desktop_cols=2, tablet_cols=1, mobile_cols=1)
     col1, col2 = st.columns(num_chart_cols) if num_chart_cols == 2 else (st.container(), st.container())
     
     with col1:
         st.markdown(f"### {t['summary']['customer_distribution']}")
         
-        customer_metrics = kpis.get('customer_metrics', {})
         distribution_data = {
             t['summary']['new_customers']: customer_metrics.get('new_customers', 0),
             t['summary']['returning_customers']: customer_metrics.get('returning_customers', 0)
         }
         
-        fig = px.pie(
-            values=list(distribution_data.values()),
-            names=list(distribution_data.keys()),
-            color_discrete_sequence=['#4CAF50', '#2196F3']
+        names, values = zip(*distribution_data.items())
+        fig = _build_pie_fig(
+            values=values,
+            names=names,
+            height=chart_height
         )
-        fig.update_layout(height=250 if is_mobile() else 300)
         
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(height=250 if is_mobile() else 350)
-        
-        st.plotly_chart(fig, use_container_width=True, config=mobile_friendly_chart_config())
+        st.plotly_chart(fig, use_container_width=True, config=chart_config)
     
     with col2:
         st.markdown(f"### {t['summary']['revenue_distribution']}")
@@ -192,27 +299,26 @@ def render_summary_page():
         revenue_dist = kpis.get('revenue_metrics', {}).get('revenue_distribution', {})
         
         if revenue_dist:
-            df_dist = pd.DataFrame({
-                'Percentile': list(revenue_dist.keys()),
-                'Value': list(revenue_dist.values())
-            })
-            
-            fig = px.bar(
-                df_dist,
-                x='Percentile',
-                y='Value',
-                color='Value',
-                color_continuous_scale='Greens'
+            fig = _build_revdist_fig(
+                tuple(revenue_dist.items()),
+                height=chart_height
             )
             
-            fig.update_layout(height=250 if is_mobile() else 350, showlegend=False)
-            
-            st.plotly_chart(fig, use_container_width=True, config=mobile_friendly_chart_config())
+            st.plotly_chart(fig, use_container_width=True, config=chart_config)
     
     # Export button
     st.markdown("---")
     st.markdown(f"## {t['export'].get('title', 'Export Report')}")
     
+    # Generated workbook bytes are kept only until the download is served or
+    # the data/language changes, so unrelated reruns re-offer the download
+    # without rebuilding the report
+    export_key = (st.session_state.get('df_clean_key'), language)
+    export_report = st.session_state.get('export_report')
+    if export_report and export_report['key'] != export_key:
+        st.session_state.pop('export_report', None)
+        export_report = None
+    
     if st.button(t['export'].get('download_excel', 'Download Excel Report'), type="primary"):
         try:
             from app.export.workbook import ExcelReportGenerator
@@ -237,14 +343,24 @@ def render_summary_page():
                 else:
                     date_str = 'latest'
                 
-                st.download_button(
-                    label=t['export'].get('download_button', 'Click to Download'),
-                    data=excel_file,
-                    file_name=f"Salla_Analysis_Report_{language}_{date_str}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+                export_report = st.session_state.export_report = {
+                    'key': export_key,
+                    'data': excel_file.getvalue(),
+                    'file_name': f"Salla_Analysis_Report_{language}_{date_str}.xlsx"
+                }
+                excel_file.close()
                 
                 st.success(t['export'].get('success', 'Report generated successfully!'))
         
         except Exception as e:
-            st.error(f"{t['errors'].get('export_error', 'Export error')}: {str(e)}")
\ No newline at end of file
+            st.error(f"{t['errors'].get('export_error', 'Export error')}: {str(e)}")
+    
+    if export_report:
+        if st.download_button(
+            label=t['export'].get('download_button', 'Click to Download'),
+            data=export_report['data'],
+            file_name=export_report['file_name'],
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        ):
+            # Served: release the bytes (the button still renders this run)
+            st.session_state.pop('export_report', None)
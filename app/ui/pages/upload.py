@@ -1,13 +1,19 @@
 """Upload page for Salla data file."""
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
+import numpy as np
 from pathlib import Path
 import logging
+import hashlib
+import copy
 from io import BytesIO
-from typing import Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 
-from app.ui.components import get_translator, show_info_banner, format_number, show_welcome_banner
+from app.ui.components import get_translator, show_info_banner, format_number, show_welcome_banner, fragment, is_debug_mode
 from app.ingestion.reader import XLSXReader
 from app.ingestion.mapper import ColumnMapper
 from app.ingestion.validators import DataValidator
@@ -17,9 +23,243 @@ from app.analytics.rfm import RFMAnalyzer
 from app.analytics.cohorts import CohortAnalyzer
 from app.analytics.products import ProductAnalyzer
 from app.analytics.anomalies import AnomalyDetector
+from app.config import DETECTION_SAMPLE_ROWS
 
 logger = logging.getLogger(__name__)
 
+# Session keys kept by "Upload New File" / dropped when a new file is read
+_PRESERVED_ON_RESET = frozenset({'language', 'lang_selector'})
+_CLEARED_ON_NEW_FILE = ('mappings', 'mapping_fingerprint', 'df_clean', 'df_clean_key')
+
+# The analyzers keep no per-run state (only fixed thresholds set in
+# __init__), so one shared instance of each serves every upload and thread
+_KPI = KPICalculator()
+_RFM = RFMAnalyzer()
+_COHORT = CohortAnalyzer()
+_PRODUCTS = ProductAnalyzer()
+_ANOMALIES = AnomalyDetector()
+
+# Fallback results for analyzers that fail; run_analysis seeds every run
+# with copies so a failing stage leaves its default in place
+_PRODUCT_EMPTY = {
+    'product_performance': {},
+    'category_analysis': {'available': False},
+    'market_basket': {'available': False},
+    'lifecycle_metrics': {'available': False},
+    'top_products': {},
+    'summary_stats': {},
+    'total_products': 0
+}
+_ANOMALY_EMPTY = {
+    'revenue_anomalies': [],
+    'order_anomalies': [],
+    'summary': {'total_anomalies': 0}
+}
+
+def _file_fingerprint(file_bytes: bytes) -> str:
+    """Content fingerprint of an uploaded file, used as the cache key downstream."""
+    return hashlib.md5(file_bytes).hexdigest()
+
+def _upload_fingerprint(uploaded_file: Any, file_bytes: bytes) -> str:
+    """
+    Return the content fingerprint of the current upload.
+    
+    The hash is kept per uploader file_id, so widget reruns don't re-hash
+    the file; a new upload (even under the same name) is hashed again.
+    """
+    upload_id = getattr(uploaded_file, 'file_id', None)
+    cached = st.session_state.get('upload_fingerprint')
+    if upload_id is not None and cached is not None and cached[0] == upload_id:
+        return cached[1]
+    fingerprint = _file_fingerprint(file_bytes)
+    st.session_state.upload_fingerprint = (upload_id, fingerprint)
+    return fingerprint
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _read_excel_cached(file_bytes: bytes, file_name: str) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Parse an uploaded workbook, memoized on the file contents.
+    
+    Re-uploading the same file (or a rerun that re-enters the read branch)
+    returns the parsed DataFrame without touching openpyxl again.
+    
+    Args:
+        file_bytes: Raw bytes of the uploaded file
+        file_name: Original file name (used for the format check)
+        
+    Returns:
+        Tuple of (DataFrame, metadata_dict)
+    """
+    # Read straight from memory - no temp file round-trip
+    file_buffer = BytesIO(file_bytes)
+    file_buffer.name = file_name
+    return XLSXReader().read_excel_file(file_buffer)
+
+def _detection_sample(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the leading rows used for auto-detection.
+    
+    Column detection and the data-level check only need a representative
+    slice, so detection cost stays flat regardless of upload size. The
+    first N rows are used rather than a random sample so that line items
+    of the same order stay together for the items-per-order check.
+    """
+    if len(df) <= DETECTION_SAMPLE_ROWS:
+        return df
+    return df.head(DETECTION_SAMPLE_ROWS)
+
+def _skip_frame_hash(df: pd.DataFrame) -> None:
+    """
+    Hash function that ignores a DataFrame argument.
+    
+    Cached wrappers below take the upload fingerprint as their first
+    argument, so Streamlit doesn't need to hash the frame itself.
+    """
+    return None
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _auto_detect_cached(fingerprint: str, df_sample: pd.DataFrame) -> Tuple[Dict[str, str], Dict[str, float]]:
+    """
+    Auto-detect column mappings, memoized on the upload fingerprint.
+    
+    Args:
+        fingerprint: Content fingerprint of the upload (see _file_fingerprint)
+        df_sample: Detection sample of the raw upload
+        
+    Returns:
+        Tuple of (mappings_dict, confidence_scores)
+    """
+    return ColumnMapper().auto_detect_columns(df_sample)
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _detect_data_level_cached(fingerprint: str, df_sample: pd.DataFrame, mapping_items: tuple) -> Dict[str, Any]:
+    """
+    Detect order vs line-item data, memoized on the upload and mappings.
+    
+    Shared by the pre-process check and process_data so the detection runs
+    once per file/mapping combination.
+    
+    Args:
+        fingerprint: Content fingerprint of the upload
+        df_sample: Detection sample, already renamed to canonical columns
+        mapping_items: Tuple of (canonical_field, source_column) pairs
+        
+    Returns:
+        Detection results from DataAggregator.detect_data_level
+    """
+    return DataAggregator().detect_data_level(df_sample, dict(mapping_items))
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _validate_cached(data_key: tuple, df: pd.DataFrame, mapping_items: tuple) -> Dict[str, Any]:
+    """
+    Validate the mapped upload, memoized per file/mapping combination.
+    
+    Args:
+        data_key: Tuple of (upload fingerprint, aggregated flag) identifying df
+        df: DataFrame with canonical column names
+        mapping_items: Sorted tuple of (canonical_field, source_column) pairs
+        
+    Returns:
+        Validation report from DataValidator.validate_dataframe
+    """
+    return DataValidator().validate_dataframe(df, dict(mapping_items))
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _clean_cached(data_key: tuple, df: pd.DataFrame, mapping_items: tuple) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Clean the mapped upload, memoized per file/mapping combination.
+    
+    Args:
+        data_key: Tuple of (upload fingerprint, aggregated flag) identifying df
+        df: DataFrame with canonical column names
+        mapping_items: Sorted tuple of (canonical_field, source_column) pairs
+        
+    Returns:
+        Tuple of (cleaned_DataFrame, cleaning_summary)
+    """
+    return DataValidator().clean_dataframe(df, dict(mapping_items), already_mapped=True)
+
+def _store_df_raw(df: pd.DataFrame):
+    """
+    Keep the raw upload in session state as LZ4-compressed Feather bytes.
+    
+    The compressed Arrow buffer is several times smaller than the parsed
+    frame and deserializes quickly when a step needs the rows again. Falls
+    back to storing the DataFrame itself if Arrow can't encode a column.
+    """
+    try:
+        buffer = BytesIO()
+        df.to_feather(buffer, compression='lz4')
+        st.session_state.df_raw = buffer.getvalue()
+    except Exception as e:
+        logger.warning(f"Could not compress raw data, keeping DataFrame in memory: {e}")
+        st.session_state.df_raw = df
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _decode_df_raw(fingerprint: str, _payload: bytes) -> pd.DataFrame:
+    """
+    Decode the stored Feather bytes, once per upload fingerprint.
+    
+    Widget reruns get the same decoded frame back instead of paying the
+    decode again. The frame is shared, so callers must not modify it in
+    place (they only relabel or replace columns on copies).
+    
+    Args:
+        fingerprint: Content fingerprint of the upload (the cache key)
+        _payload: Feather bytes written by _store_df_raw (not hashed)
+        
+    Returns:
+        The raw upload DataFrame
+    """
+    return pd.read_feather(BytesIO(_payload))
+
+def _load_df_raw() -> pd.DataFrame:
+    """Return the raw upload stored by _store_df_raw."""
+    df_raw = st.session_state.df_raw
+    if isinstance(df_raw, bytes):
+        return _decode_df_raw(st.session_state.df_fingerprint, df_raw)
+    return df_raw
+
+def _shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Narrow integer columns and categorize low-cardinality labels.
+    
+    Integers are narrowed no further than int32 so arithmetic in the
+    analyzers can't overflow. Float columns hold money and stay float64 -
+    float32 can't represent multi-million totals to the cent.
+    
+    Args:
+        df: Cleaned DataFrame (modified in place)
+        
+    Returns:
+        The same DataFrame
+    """
+    int32 = np.iinfo(np.int32)
+    for col in df.select_dtypes('integer').columns:
+        series = df[col]
+        if series.dtype.itemsize > 4 and (series.empty or (series.min() >= int32.min and series.max() <= int32.max)):
+            df[col] = series.astype(np.int32)
+    
+    for col in ('order_status', 'currency'):
+        if col in df.columns and df[col].dtype == object:
+            series = df[col]
+            if (pd.api.types.infer_dtype(series, skipna=True) == 'string'
+                    and series.nunique() < 0.5 * len(series)):
+                df[col] = series.astype('category')
+    
+    return df
+
+def _apply_mappings(df: pd.DataFrame, rename_dict: Dict[str, str]) -> pd.DataFrame:
+    """
+    Rename source columns to canonical names without copying column data.
+    
+    DataFrame.rename deep-copies every column by default; a shallow copy
+    with a relabelled column index is all the mapping step needs.
+    """
+    df_mapped = df.copy(deep=False)
+    df_mapped.columns = [rename_dict.get(col, col) for col in df.columns]
+    return df_mapped
+
 def _clean_concatenated_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean columns that have concatenated text values due to data corruption.
@@ -65,10 +305,16 @@ def _clean_concatenated_columns(df: pd.DataFrame) -> pd.DataFrame:
                 if needs_cleaning:
                     logger.warning(f"Column '{col}' appears to have concatenated values. Cleaning...")
                     
-                    # Fix the entire column by taking only first occurrence
-                    df_clean[col] = df_clean[col].apply(
-                        lambda x: _extract_first_value(x) if isinstance(x, str) and len(x) > 20 else x
-                    )
+                    # Fix the entire column by taking only first occurrence.
+                    # Corrupted columns repeat a handful of values, so clean
+                    # each distinct value once and map the result back
+                    values = df_clean[col]
+                    cleaned = {
+                        x: _extract_first_value(x) for x in pd.unique(values.dropna())
+                        if isinstance(x, str) and len(x) > 20
+                    }
+                    if cleaned:
+                        df_clean[col] = values.map(cleaned).fillna(values)
                     
             except Exception as e:
                 logger.debug(f"Error checking column '{col}': {e}")
@@ -103,12 +349,45 @@ def _extract_first_value(text: str) -> str:
     # No repetition found - return original
     return text
 
-def _update_mapping(field: str, value: str | None):
-    """Update mapping in session state when selectbox changes."""
+def _on_mapping_change(field: str):
+    """Update mapping in session state when a mapping selectbox changes."""
+    value = st.session_state.get(f"map_{field}")
     if value:
         st.session_state.mappings[field] = value
-    elif field in st.session_state.mappings:
-        del st.session_state.mappings[field]
+    else:
+        st.session_state.mappings.pop(field, None)
+
+def _render_mapping_select(field: str, label: str, available_columns: List[str],
+                           col_to_index: Dict[str, int]):
+    """Render the selectbox used to map one canonical field to a source column."""
+    current_mapping = st.session_state.mappings.get(field, '')
+    confidence_pct = st.session_state.get('confidence_pct_str', {})
+    st.selectbox(
+        label,
+        options=available_columns,
+        index=col_to_index.get(current_mapping, 0),
+        key=f"map_{field}",
+        help=f"Confidence: {confidence_pct[field]}" if field in confidence_pct else None,
+        on_change=_on_mapping_change,
+        args=(field,)
+    )
+
+@fragment
+def _render_preview(df: pd.DataFrame, label: str):
+    """Render the raw data preview expander (isolated from page reruns)."""
+    with st.expander(label, expanded=False):
+        st.dataframe(df.head(10))
+
+@fragment
+def _render_detected_mappings(mappings: Dict[str, str], confidence_pct: Dict[str, str]):
+    """Render the auto-detected mappings debug expander (isolated from page reruns)."""
+    with st.expander("🔍 Debug: All Auto-Detected Mappings", expanded=False):
+        rows = [
+            f"| ✅ `{field}` | `{column}` | {confidence_pct.get(field, '0%')} |" if column
+            else f"| ❌ `{field}` | NOT DETECTED | |"
+            for field, column in mappings.items()
+        ]
+        st.markdown("| Field | Column | Confidence |\n|---|---|---|\n" + "\n".join(rows))
 
 def render_upload_page():
     """Render the data upload and processing page."""
@@ -194,27 +473,23 @@ def render_upload_page():
         
         # All available analyses in compact format
         with st.expander("📈 See All Available Analyses", expanded=False):
-            cols = st.columns(2)
-            with cols[0]:
-                st.markdown("""
-                ✅ **Executive Summary** - KPIs & trends  
-                ✅ **Financial Insights** - Action plans  
-                ✅ **Customer Segmentation** - RFM analysis
-                """)
-            with cols[1]:
-                st.markdown("""
-                ✅ **Cohort Analysis** - Retention trends  
-                ✅ **Product Performance** - Top sellers  
-                ✅ **Action Playbooks** - Quick wins
-                """)
+            st.markdown("""
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(220px,1fr));gap:4px 16px">
+                <div>✅ <b>Executive Summary</b> - KPIs &amp; trends</div>
+                <div>✅ <b>Cohort Analysis</b> - Retention trends</div>
+                <div>✅ <b>Financial Insights</b> - Action plans</div>
+                <div>✅ <b>Product Performance</b> - Top sellers</div>
+                <div>✅ <b>Customer Segmentation</b> - RFM analysis</div>
+                <div>✅ <b>Action Playbooks</b> - Quick wins</div>
+            </div>
+            """, unsafe_allow_html=True)
         
         # Upload new file option (less prominent)
         st.markdown("---")
         if st.button("� Upload New File", type="secondary"):
             # Clear session state for new upload
-            for key in list(st.session_state.keys()):
-                if key not in ['language', 'lang_selector']:
-                    del st.session_state[key]
+            for key in [k for k in st.session_state if k not in _PRESERVED_ON_RESET]:
+                st.session_state.pop(key, None)
             st.rerun()
         return  # Don't render the upload form again
 
@@ -233,8 +508,9 @@ def render_upload_page():
             return
         
         # Validate file size (max 50MB)
+        file_bytes = uploaded_file.getvalue()
         try:
-            file_size_mb = len(uploaded_file.getvalue()) / (1024 * 1024)
+            file_size_mb = len(file_bytes) / (1024 * 1024)
             if file_size_mb > 50:
                 st.error(f"❌ File too large ({file_size_mb:.1f} MB). Maximum size is 50 MB")
                 st.info("💡 **Tip**: Try filtering to a shorter date range in Salla before exporting")
@@ -253,67 +529,47 @@ def render_upload_page():
         )
         
         try:
-            # Step 1: Read file (only once per file)
-            if 'df_raw' not in st.session_state or st.session_state.get('current_file') != uploaded_file.name:
+            # Step 1: Read file (only once per file contents)
+            fingerprint = _upload_fingerprint(uploaded_file, file_bytes)
+            if 'df_raw' not in st.session_state or st.session_state.get('df_fingerprint') != fingerprint:
                 with st.spinner(t['upload']['reading_file']):
                     try:
-                        reader = XLSXReader()
-                        # Save uploaded file temporarily
-                        import tempfile
-                        import os
+                        df_raw, metadata = _read_excel_cached(file_bytes, uploaded_file.name)
                         
-                        tmp_path = None
-                        try:
-                            with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-                                tmp_file.write(uploaded_file.getvalue())
-                                tmp_path = tmp_file.name
-                            
-                            df_raw, metadata = reader.read_excel_file(tmp_path)
-                            
-                            # Validate file is not empty
-                            if len(df_raw) == 0:
-                                st.error("❌ The uploaded file contains no data")
-                                st.info("💡 **Tip**: Make sure your Salla export includes order data")
-                                return
-                            
-                            if len(df_raw.columns) == 0:
-                                st.error("❌ The uploaded file has no columns")
-                                st.info("💡 **Tip**: The file may be corrupted. Try re-exporting from Salla")
-                                return
-                            
-                            # Clean concatenated text columns (fix data corruption issues)
-                            df_raw = _clean_concatenated_columns(df_raw)
-                            
-                            # CRITICAL: Clear all old state when new file is uploaded
-                            st.session_state.df_raw = df_raw
-                            st.session_state.metadata = metadata
-                            st.session_state.current_file = uploaded_file.name
-                            
-                            # Clear old mappings and analysis results
-                            if 'mappings' in st.session_state:
-                                del st.session_state.mappings
-                            if 'mapping_file' in st.session_state:
-                                del st.session_state.mapping_file
-                            if 'df_clean' in st.session_state:
-                                del st.session_state.df_clean
-                            if 'analysis_results' in st.session_state:
-                                st.session_state.analysis_results = {}
-                            # Clear data_loaded flag when new file uploaded
-                            st.session_state.data_loaded = False
-                            
-                            st.success(t['upload']['file_read_success'].format(
-                                rows=format_number(len(df_raw), language, decimals=0),
-                                columns=format_number(len(df_raw.columns), language, decimals=0)
-                            ))
-                            
-                        finally:
-                            # Clean up temp file
-                            if tmp_path and os.path.exists(tmp_path):
-                                try:
-                                    os.unlink(tmp_path)
-                                except (PermissionError, OSError):
-                                    # File might still be in use, try again later
-                                    pass
+                        # Validate file is not empty
+                        if len(df_raw) == 0:
+                            st.error("❌ The uploaded file contains no data")
+                            st.info("💡 **Tip**: Make sure your Salla export includes order data")
+                            return
+                        
+                        if len(df_raw.columns) == 0:
+                            st.error("❌ The uploaded file has no columns")
+                            st.info("💡 **Tip**: The file may be corrupted. Try re-exporting from Salla")
+                            return
+                        
+                        # Clean concatenated text columns (fix data corruption issues)
+                        df_raw = _clean_concatenated_columns(df_raw)
+                        
+                        # CRITICAL: Clear all old state when new file is uploaded
+                        _store_df_raw(df_raw)
+                        st.session_state.df_fingerprint = fingerprint
+                        st.session_state.metadata = metadata
+                        st.session_state.current_file = uploaded_file.name
+                        
+                        # Clear old mappings and analysis results
+                        for key in _CLEARED_ON_NEW_FILE:
+                            st.session_state.pop(key, None)
+                        st.session_state.analysis_results = {}
+                        # Clear data_loaded flag when new file uploaded
+                        st.session_state.data_loaded = False
+                        
+                        # Format once per language; reruns reuse the stored message
+                        read_success_msg = t['upload']['file_read_success'].format(
+                            rows=format_number(len(df_raw), language, decimals=0),
+                            columns=format_number(len(df_raw.columns), language, decimals=0)
+                        )
+                        st.session_state.read_success_msg = (language, read_success_msg)
+                        st.success(read_success_msg)
                     
                     except pd.errors.EmptyDataError:
                         st.error("❌ The uploaded Excel file is empty")
@@ -330,11 +586,13 @@ def render_upload_page():
                         return
             else:
                 # Use cached dataframe
-                df_raw = st.session_state.df_raw
+                df_raw = _load_df_raw()
+                msg_language, read_success_msg = st.session_state.get('read_success_msg', (None, None))
+                if read_success_msg and msg_language == language:
+                    st.success(read_success_msg)
             
             # Show preview
-            with st.expander(t['upload']['preview_data'], expanded=False):
-                st.dataframe(df_raw.head(10))
+            _render_preview(df_raw, t['upload']['preview_data'])
             
             # Step 2: Column mapping
             st.markdown(f"## {t['upload']['step_mapping']}")
@@ -343,13 +601,13 @@ def render_upload_page():
             # CRITICAL: Clear old mappings when a new file is uploaded!
             if ('mappings' not in st.session_state or 
                 len(st.session_state.mappings) == 0 or 
-                st.session_state.get('mapping_file') != uploaded_file.name):
-                
-                mapper = ColumnMapper()
+                st.session_state.get('mapping_fingerprint') != st.session_state.df_fingerprint):
                 
                 # Try auto-detection (only once per file)
                 with st.spinner(t['upload']['detecting_columns']):
-                    auto_mappings, confidence_scores = mapper.auto_detect_columns(df_raw)
+                    auto_mappings, confidence_scores = _auto_detect_cached(
+                        st.session_state.df_fingerprint, _detection_sample(df_raw)
+                    )
                     
                     # Calculate average confidence for required fields only
                     required_fields = ['order_id', 'order_date', 'customer_id', 'order_total']
@@ -359,7 +617,10 @@ def render_upload_page():
                     # Store in session state
                     st.session_state.mappings = auto_mappings
                     st.session_state.confidence_scores = confidence_scores
-                    st.session_state.mapping_file = uploaded_file.name  # Track which file these mappings are for
+                    st.session_state.confidence_pct_str = {
+                        field: f"{score:.0%}" for field, score in confidence_scores.items()
+                    }
+                    st.session_state.mapping_fingerprint = st.session_state.df_fingerprint  # Track which file these mappings are for
                     
                     if avg_confidence >= 0.8:
                         st.success(t['upload']['auto_detect_success'].format(
@@ -375,9 +636,10 @@ def render_upload_page():
             
             # Show what was auto-detected
             if st.session_state.mappings:
-                detected_fields = [k for k, v in st.session_state.mappings.items() if v]
+                detected_fields = tuple(k for k, v in st.session_state.mappings.items() if v)
+                detected_set = frozenset(detected_fields)
                 required_fields_list = ['order_id', 'order_date', 'customer_id', 'order_total']
-                missing_required = [f for f in required_fields_list if f not in detected_fields]
+                missing_required = [f for f in required_fields_list if f not in detected_set]
                 
                 st.success(f"✅ Auto-detected {len(detected_fields)} fields: {', '.join(detected_fields)}")
                 
@@ -385,16 +647,12 @@ def render_upload_page():
                     st.warning(f"⚠️ Missing required fields: {', '.join(missing_required)}")
                     
                 # Debug: Show all mappings
-                with st.expander("🔍 Debug: All Auto-Detected Mappings", expanded=False):
-                    for field, column in st.session_state.mappings.items():
-                        confidence = st.session_state.confidence_scores.get(field, 0)
-                        if column:
-                            st.write(f"✅ {field}: '{column}' (confidence: {confidence:.0%})")
-                        else:
-                            st.write(f"❌ {field}: NOT DETECTED")
+                if is_debug_mode():
+                    _render_detected_mappings(st.session_state.mappings, st.session_state.confidence_pct_str)
             
             # Allow manual adjustment
             available_columns = [''] + list(df_raw.columns)
+            col_to_index = {c: i for i, c in enumerate(available_columns)}
             
             # Required fields
             st.markdown(f"**{t['upload']['required_fields']}**")
@@ -411,16 +669,7 @@ def render_upload_page():
             for idx, (field, label) in enumerate(required_fields.items()):
                 target_col = col1 if idx % 2 == 0 else col2
                 with target_col:
-                    current_mapping = st.session_state.mappings.get(field, '')
-                    # Use on_change callback instead of direct assignment
-                    st.selectbox(
-                        label,
-                        options=available_columns,
-                        index=available_columns.index(current_mapping) if current_mapping in available_columns else 0,
-                        key=f"map_{field}",
-                        help=f"Confidence: {st.session_state.confidence_scores.get(field, 0):.0%}" if field in st.session_state.get('confidence_scores', {}) else None,
-                        on_change=lambda f=field: _update_mapping(f, st.session_state.get(f"map_{f}"))
-                    )
+                    _render_mapping_select(field, label, available_columns, col_to_index)
             
             # Optional fields
             with st.expander(t['upload']['optional_fields'], expanded=False):
@@ -441,23 +690,12 @@ def render_upload_page():
                 for idx, (field, label) in enumerate(optional_fields.items()):
                     target_col = col1 if idx % 2 == 0 else col2
                     with target_col:
-                        current_mapping = st.session_state.mappings.get(field, '')
-                        # Use on_change callback instead of direct assignment
-                        st.selectbox(
-                            label,
-                            options=available_columns,
-                            index=available_columns.index(current_mapping) if current_mapping in available_columns else 0,
-                            key=f"map_{field}",
-                            help=f"Confidence: {st.session_state.confidence_scores.get(field, 0):.0%}" if field in st.session_state.get('confidence_scores', {}) else None,
-                            on_change=lambda f=field: _update_mapping(f, st.session_state.get(f"map_{f}"))
-                        )
+                        _render_mapping_select(field, label, available_columns, col_to_index)
             
             # Step 3: Validate and process
-            # Track current file for aggregation approval
+            # Track current file contents for aggregation approval
             current_file = st.session_state.get('current_file', uploaded_file.name)
-            st.session_state.current_file = current_file
-            
-            aggregation_approved_key = f"agg_approved_{current_file}"
+            aggregation_approved_key = f"agg_approved_{st.session_state.df_fingerprint}"
             
             # Validate mappings before showing process button
             required_fields = ['order_id', 'order_date', 'customer_id', 'order_total']
@@ -484,10 +722,11 @@ def render_upload_page():
                     """)
                 return
             
+            rename_dict = {v: k for k, v in st.session_state.mappings.items() if v}
+            
             # Show preview of mapped data
             with st.expander("🔍 Preview Mapped Data (First 5 Rows)", expanded=False):
-                rename_dict = {v: k for k, v in st.session_state.mappings.items() if v}
-                preview_df = st.session_state.df_raw.rename(columns=rename_dict)
+                preview_df = _apply_mappings(df_raw, rename_dict)
                 
                 # Show only mapped columns
                 mapped_cols = [k for k in required_fields if k in preview_df.columns]
@@ -498,17 +737,16 @@ def render_upload_page():
             # Check if we need to show aggregation approval UI first
             # Quick pre-check: does data need aggregation and is it not yet approved?
             needs_aggregation_check = False
-            aggregator = DataAggregator()
             
             # Only do this check if Process button is clicked and aggregation not yet approved
             should_process = st.button(t['upload']['process_button'], type="primary", use_container_width=True)
             
             if should_process and aggregation_approved_key not in st.session_state:
                 # Quick check if data needs aggregation before full processing
-                mapper = ColumnMapper()
-                rename_dict = {v: k for k, v in st.session_state.mappings.items() if v}
-                df_temp = st.session_state.df_raw.rename(columns=rename_dict)
-                detection = aggregator.detect_data_level(df_temp, st.session_state.mappings)
+                df_temp = _apply_mappings(_detection_sample(df_raw), rename_dict)
+                detection = _detect_data_level_cached(
+                    st.session_state.df_fingerprint, df_temp, tuple(st.session_state.mappings.items())
+                )
                 
                 if detection['requires_aggregation']:
                     # Show aggregation approval UI
@@ -547,8 +785,8 @@ def render_upload_page():
             # Now process if button clicked and aggregation approval isn't needed
             if should_process and not needs_aggregation_check:
                 logger.info("🔘 PROCESS DATA BUTTON CLICKED - starting processing")
-                # Use the dataframe from session state (guaranteed to have ALL rows)
-                process_data(st.session_state.df_raw, st.session_state.mappings, t, language)
+                # Use the full raw dataframe (guaranteed to have ALL rows)
+                process_data(df_raw, st.session_state.mappings, t, language)
         
         except Exception as e:
             logger.error(f"Error processing upload: {e}", exc_info=True)
@@ -569,11 +807,16 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
     logger.info("🚀 PROCESS_DATA CALLED - Starting data processing")
     logger.info("   DataFrame: %s rows x %s columns", len(df_raw), len(df_raw.columns))
     logger.info("   Mappings: %s", mappings)
-    st.info("🚀 **DEBUG**: Process Data function called - starting validation...")
+    debug = is_debug_mode()
 
-    progress_panel = st.expander("🧩 Debug: Process Data Progress", expanded=True)
+    # Debug-only progress panel; production runs skip the element writes
+    if debug:
+        st.info("🚀 **DEBUG**: Process Data function called - starting validation...")
+        progress_panel = st.expander("🧩 Debug: Process Data Progress", expanded=True)
 
     def log_progress(step: str, **details: Any) -> None:
+        if not debug:
+            return
         entry = {"step": step}
         entry.update(details)
         progress_panel.write(entry)
@@ -605,24 +848,27 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
         
         # Apply mappings
         rename_dict = {v: k for k, v in mappings.items() if v}
-        df_mapped = df_raw.rename(columns=rename_dict)
+        df_mapped = _apply_mappings(df_raw, rename_dict)
         
-        # Convert date columns to datetime immediately after mapping
+        # Convert date and amount columns immediately after mapping, now that
+        # we know which raw columns they are
         if 'order_date' in df_mapped.columns:
             df_mapped['order_date'] = pd.to_datetime(df_mapped['order_date'], errors='coerce')
         if 'first_purchase_date' in df_mapped.columns:
             df_mapped['first_purchase_date'] = pd.to_datetime(df_mapped['first_purchase_date'], errors='coerce')
+        if 'order_total' in df_mapped.columns:
+            df_mapped['order_total'] = pd.to_numeric(df_mapped['order_total'], errors='coerce')
         
         # Debug: Show actual mapping transformation
-        with st.expander("🔍 Debug: Column Mapping Applied", expanded=False):
-            st.write("**Mappings Dictionary:**")
-            for canonical, original in mappings.items():
-                if original:
-                    st.write(f"   {original} → {canonical}")
-            st.write("\n**Columns Before Mapping:**", list(df_raw.columns[:10]))
-            st.write("**Columns After Mapping:**", list(df_mapped.columns[:10]))
-            if 'order_date' in df_mapped.columns:
-                st.write(f"**Order Date Type:**", df_mapped['order_date'].dtype)
+        if debug:
+            with st.expander("🔍 Debug: Column Mapping Applied", expanded=False):
+                lines = ["**Mappings Dictionary:**"]
+                lines += [f"- `{original}` → `{canonical}`" for canonical, original in mappings.items() if original]
+                lines.append(f"\n**Columns Before Mapping:** {list(df_raw.columns[:10])}")
+                lines.append(f"\n**Columns After Mapping:** {list(df_mapped.columns[:10])}")
+                if 'order_date' in df_mapped.columns:
+                    lines.append(f"\n**Order Date Type:** `{df_mapped['order_date'].dtype}`")
+                st.markdown("\n".join(lines))
         
         # Debug info
         st.info(f"📊 **Data Summary**: {len(df_raw):,} rows loaded from file → {len(df_mapped):,} rows after mapping")
@@ -631,49 +877,26 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
         aggregator = DataAggregator()
         
         with st.spinner("🔍 Analyzing data structure..."):
-            detection = aggregator.detect_data_level(df_mapped, mappings)
+            # Same sample/mappings as the pre-process check, so this is a cache hit
+            detection = _detect_data_level_cached(
+                st.session_state.df_fingerprint,
+                _apply_mappings(_detection_sample(df_raw), rename_dict),
+                tuple(mappings.items())
+            )
             
             if detection['requires_aggregation']:
                 logger.info(f"📦 Line-item data detected - requires aggregation")
                 log_progress(
                     "aggregation_required",
-                    status="waiting for user approval",
+                    status="line-item data detected",
                     confidence=detection['confidence'],
                     indicators=detection['indicators'],
                 )
                 
-                # Check if user already approved aggregation
-                current_file = st.session_state.get('current_file', 'unknown')
-                aggregation_approved_key = f"agg_approved_{current_file}"
-                
-                if aggregation_approved_key not in st.session_state:
-                    # Show detection info
-                    st.info(f"📦 **Line-Item Data Detected** ({detection['confidence']*100:.0f}% confidence)")
-                    st.info(f"**Indicators**: {', '.join(detection['indicators'])}")
-                    
-                    # Show aggregation options
-                    with st.expander("🔄 Data Aggregation Required", expanded=True):
-                        aggregation_help = "\n".join([
-                            "Your data appears to be at **line-item level** (one row per product/item).",
-                            "The analysis needs **order-level data** (one row per order).",
-                            "",
-                            "**Aggregation will:**",
-                            "- Group items into orders (by customer + date)",
-                            "- Sum item prices to get order totals",
-                            "- Count items per order",
-                            "- Preserve customer and date information",
-                        ])
-                        st.markdown(aggregation_help)
-
-                        if st.button("✅ Aggregate to Order Level", type="primary", key="aggregate_btn"):
-                            logger.info("🔘 AGGREGATE BUTTON CLICKED - setting approval flag")
-                            st.session_state[aggregation_approved_key] = True
-                            # Set auto-process flag so process_data runs automatically after rerun
-                            auto_process_key = f"auto_process_{current_file}"
-                            st.session_state[auto_process_key] = True
-                            st.rerun()
-                    
-                    st.info("👆 Click above to proceed with aggregation")
+                # render_upload_page shows the approval UI and only calls
+                # process_data once aggregation has been approved
+                if not st.session_state.get(f"agg_approved_{st.session_state.df_fingerprint}"):
+                    logger.warning("Line-item data reached process_data without aggregation approval")
                     return
                 
                 # User has approved aggregation - perform it now
@@ -698,14 +921,27 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
             else:
                 st.success(f"✅ **Order-Level Data Detected** - No aggregation needed")
         
+        # Project down to the columns analysis can use: mapped canonical fields
+        # plus anything derived by aggregation. Unmapped source columns would
+        # otherwise be copied through validation, cleaning and every analyzer.
+        mapped_fields = {field for field, column in mappings.items() if column}
+        source_columns = set(df_raw.columns)
+        keep_columns = [
+            col for col in df_mapped.columns
+            if col in mapped_fields or col not in source_columns
+        ]
+        if len(keep_columns) < len(df_mapped.columns):
+            df_mapped = df_mapped[keep_columns]
+        
         log_progress("data_validation", status="validating dataframe")
 
-        # Validate data
-        validator = DataValidator()
+        # Validate data (cached per file/mapping combination)
+        mapping_items = tuple(sorted(mappings.items()))
+        data_key = (st.session_state.df_fingerprint, detection['requires_aggregation'])
         
         with st.spinner(t['upload']['validating_data']):
             try:
-                validation_report = validator.validate_dataframe(df_mapped, mappings)
+                validation_report = _validate_cached(data_key, df_mapped, mapping_items)
                 
                 # Store currency info in session state for analysis
                 if 'currency_info' in validation_report:
@@ -767,11 +1003,8 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
         # Clean data
         with st.spinner(t['upload']['cleaning_data']):
             try:
-                df_clean, cleaning_summary = validator.clean_dataframe(
-                    df_mapped, 
-                    mappings,
-                    already_mapped=True  # Columns already renamed to canonical names
-                )
+                # Columns already renamed to canonical names
+                df_clean, cleaning_summary = _clean_cached(data_key, df_mapped, mapping_items)
                 
                 rows_removed = cleaning_summary['removed_rows']
                 if rows_removed > 0:
@@ -795,22 +1028,28 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
                 st.info("**Tip:** Try processing the data anyway by skipping cleaning (this feature coming soon)")
                 return
         
-        # Store cleaned data
+        # Store cleaned data with the key that identifies it for page caches
+        df_clean = _shrink_dtypes(df_clean)
+        analysis_key = data_key + (mapping_items,)
         st.session_state.df_clean = df_clean
+        st.session_state.df_clean_key = analysis_key
         st.session_state.validation_report = validation_report
         
         # Debug: Show columns before analysis
-        with st.expander("🔍 Debug: Columns Before Analysis", expanded=False):
-            st.write(f"**Total columns**: {len(df_clean.columns)}")
-            st.write(f"**Column names**: {list(df_clean.columns)}")
-            required = ['order_date', 'customer_id', 'order_total']
-            st.write(f"**Required columns present**: {[col for col in required if col in df_clean.columns]}")
-            st.write(f"**Required columns missing**: {[col for col in required if col not in df_clean.columns]}")
+        if debug:
+            with st.expander("🔍 Debug: Columns Before Analysis", expanded=False):
+                required = ['order_date', 'customer_id', 'order_total']
+                st.markdown("\n\n".join([
+                    f"**Total columns**: {len(df_clean.columns)}",
+                    f"**Column names**: {list(df_clean.columns)}",
+                    f"**Required columns present**: {[col for col in required if col in df_clean.columns]}",
+                    f"**Required columns missing**: {[col for col in required if col not in df_clean.columns]}",
+                ]))
         
         log_progress("analysis", status="running analysis")
 
         # Run analysis
-        run_analysis(df_clean, t, language)
+        run_analysis(df_clean, t, language, analysis_key)
         
         # Analysis is complete and data_loaded is set to True
         # The natural page flow will handle showing the success message
@@ -821,30 +1060,109 @@ def process_data(df_raw: pd.DataFrame, mappings: Dict[str, str], t: Dict[str, An
         log_progress("error", error=str(e))
         st.error(t['errors']['processing_error'].format(error=str(e)))
 
-def run_analysis(df: pd.DataFrame, t: Dict[str, Any], language: str):
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _compute_kpis(data_key: tuple, df: pd.DataFrame, currency: Any) -> Dict[str, Any]:
+    """
+    Calculate KPIs on the rows with a usable order total.
+    
+    The analyzer wrappers are memoized on data_key (upload fingerprint,
+    aggregation flag and mappings), so reprocessing the same file with the
+    same mappings skips the analysis entirely.
+    """
+    # Shallow copy: the numeric coercion below replaces whole columns, so the
+    # shared input frame is never modified and no column data is duplicated
+    df_for_kpis = df.copy(deep=False)
+    
+    # Ensure numeric columns are actually numeric
+    numeric_cols = ['order_total', 'quantity', 'shipping', 'taxes', 'refund_amount']
+    for col in numeric_cols:
+        if col in df_for_kpis.columns:
+            df_for_kpis[col] = pd.to_numeric(df_for_kpis[col], errors='coerce')
+    
+    # Remove completely invalid rows
+    df_for_kpis = df_for_kpis[df_for_kpis['order_total'].notna()]
+    
+    logger.info(f"📊 Calculating KPIs on {len(df_for_kpis)} valid orders")
+    return _KPI.calculate_all_kpis(df_for_kpis, currency=currency)
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _summarize_customers(data_key: tuple, df: pd.DataFrame) -> pd.DataFrame:
+    """Per-customer order summary shared by the RFM and cohort analyzers."""
+    return _RFM.summarize_customers(df)
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _compute_rfm(data_key: tuple, df: pd.DataFrame, customer_agg: Optional[pd.DataFrame]) -> Dict[str, Any]:
+    """Score customers and build the RFM segment summary and heatmap."""
+    rfm_df = _RFM.calculate_rfm_scores(df, customer_agg=customer_agg)
+    return {
+        'rfm_data': rfm_df,
+        'segment_summary': _RFM.get_segment_summary(rfm_df),
+        'heatmap_data': _RFM.get_rfm_heatmap_data(rfm_df)
+    }
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _compute_cohorts(data_key: tuple, df: pd.DataFrame, customer_agg: Optional[pd.DataFrame]) -> Dict[str, Any]:
+    """Run the cohort retention analysis."""
+    return _COHORT.perform_cohort_analysis(df, customer_agg=customer_agg)
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _compute_products(data_key: tuple, df: pd.DataFrame) -> Dict[str, Any]:
+    """Run the product performance analysis."""
+    return _PRODUCTS.analyze_products(df)
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _skip_frame_hash})
+def _compute_anomalies(data_key: tuple, df: pd.DataFrame) -> Dict[str, Any]:
+    """Run revenue and order anomaly detection."""
+    return _ANOMALIES.detect_anomalies(df)
+
+def _handle_analysis_failure(key: str, error: Exception):
+    """Report a failed analyzer; its preallocated default result stays in place."""
+    if key == 'kpis':
+        logger.error(f"KPI calculation failed: {error}", exc_info=error)
+        
+        # Show detailed error information
+        error_msg = str(error)
+        if "Could not convert" in error_msg and "to numeric" in error_msg:
+            st.error(f"❌ Data Quality Issue: Some columns contain invalid data that can't be processed as numbers.")
+            st.info("💡 **Tip**: Check that numeric columns (order total, quantity, etc.) contain only numbers, not text.")
+        else:
+            st.error(f"❌ KPI calculation failed: {error_msg}")
+    elif key == 'rfm':
+        logger.error(f"RFM analysis failed: {error}", exc_info=error)
+        st.error(f"❌ RFM analysis failed: {str(error)}")
+    elif key == 'cohorts':
+        logger.error(f"Cohort analysis failed: {error}", exc_info=error)
+        st.error(f"❌ Cohort analysis failed: {str(error)}")
+    elif key == 'products':
+        logger.warning(f"Product analysis skipped: {error}")
+        st.info("ℹ️ Product analysis skipped - no product data available in file")
+    elif key == 'anomalies':
+        logger.warning(f"Anomaly detection failed: {error}")
+
+def run_analysis(df: pd.DataFrame, t: Dict[str, Any], language: str, data_key: tuple):
     """Run all analysis modules on the clean data.
     
     Args:
         df: Clean dataframe
         t: Translations
         language: Language code
+        data_key: Cache key identifying df (fingerprint, aggregation flag, mappings)
     """
-    st.markdown(f"## {t['upload']['running_analysis']}")
+    # Results for this exact data are already in session state
+    if st.session_state.get('data_loaded') and st.session_state.get('analysis_fp') == data_key:
+        logger.info("Analysis already complete for this data - skipping")
+        return
     
-    # Use a container for progress elements so they can be cleared
-    progress_container = st.container()
+    st.markdown(f"## {t['upload']['running_analysis']}")
     
-    with progress_container:
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+    # One slot holds both the progress bar and the status line, so each
+    # update is a single element write
+    progress_slot = st.empty()
     
     try:
-        # Debug: Verify dataframe size at start of analysis
-        st.write(f"**Analysis Input**: {len(df):,} rows × {len(df.columns)} columns")
-        
         # Check for required columns
         required_cols = ['order_date', 'customer_id', 'order_total']
-        missing_cols = [col for col in required_cols if col not in df.columns]
+        missing_cols = sorted(set(required_cols).difference(df.columns))
         if missing_cols:
             st.error(f"❌ Missing required columns for analysis: {', '.join(missing_cols)}")
             with st.expander("🔍 Debug: Available Columns", expanded=True):
@@ -857,158 +1175,110 @@ def run_analysis(df: pd.DataFrame, t: Dict[str, Any], language: str):
             logger.error(f"Missing required columns: {missing_cols}. Available: {list(df.columns)}")
             return
         
-        # Show date range safely
-        try:
-            min_date = df['order_date'].min()
-            max_date = df['order_date'].max()
-            st.write(f"**Date range**: {min_date} to {max_date}")
-        except Exception as e:
-            st.warning(f"⚠️ Could not determine date range: {e}")
+        # Input summary is debug-only: it costs several full-column passes
+        # and UI writes on every upload
+        if is_debug_mode():
+            st.write(f"**Analysis Input**: {len(df):,} rows × {len(df.columns)} columns")
+            
+            # Show date range, customer count and revenue, reducing the raw
+            # arrays directly rather than going through pandas' reduction dispatch
+            try:
+                order_dates = df['order_date'].to_numpy()
+                customer_ids = pd.unique(df['customer_id'].to_numpy())
+                min_date = pd.Timestamp(np.nanmin(order_dates))
+                max_date = pd.Timestamp(np.nanmax(order_dates))
+                unique_customers = customer_ids.size - int(pd.isna(customer_ids).any())
+                total_revenue = np.nansum(df['order_total'].to_numpy(dtype='float64'))
+                # Get currency from session state if available
+                currency_display = ""
+                if 'currency_info' in st.session_state:
+                    currency = st.session_state.currency_info.get('default_currency')
+                    if currency:
+                        currency_display = f"{currency} "
+                st.markdown("\n\n".join([
+                    f"**Date range**: {min_date} to {max_date}",
+                    f"**Unique customers**: {unique_customers:,}",
+                    f"**Total revenue**: {currency_display}{total_revenue:,.2f}",
+                ]))
+            except Exception as e:
+                st.warning(f"⚠️ Could not summarize the data: {e}")
+            
+        # Get currency from validation results, or use None for generic
+        currency = None
+        if 'currency_info' in st.session_state:
+            currency = st.session_state.currency_info.get('default_currency')
+        logger.info(f"💰 Using currency for KPIs: {currency}")
         
-        # Show customer count
+        # RFM and cohorts both start from the same per-customer summary;
+        # build it once and let each analyzer fall back to its own groupby
+        # if it can't be built (e.g. no order_id column)
         try:
-            unique_customers = df['customer_id'].nunique()
-            st.write(f"**Unique customers**: {unique_customers:,}")
+            customer_agg = _summarize_customers(data_key, df)
         except Exception as e:
-            st.warning(f"⚠️ Could not count customers: {e}")
+            logger.warning(f"Shared customer summary unavailable: {e}")
+            customer_agg = None
         
-        # Show revenue
-        try:
-            total_revenue = df['order_total'].sum()
-            # Get currency from session state if available
-            currency_display = ""
-            if 'currency_info' in st.session_state:
-                currency = st.session_state.currency_info.get('default_currency')
-                if currency:
-                    currency_display = f"{currency} "
-            st.write(f"**Total revenue**: {currency_display}{total_revenue:,.2f}")
-        except Exception as e:
-            st.warning(f"⚠️ Could not calculate revenue: {e}")
+        # The analyzers are independent and only read df, so run them
+        # concurrently; pandas/NumPy kernels release the GIL. Streamlit calls
+        # stay on this thread - workers have no script run context.
+        jobs = {
+            'kpis': (t['upload']['analyzing_kpis'], lambda: _compute_kpis(data_key, df, currency)),
+            'rfm': (t['upload']['analyzing_rfm'], lambda: _compute_rfm(data_key, df, customer_agg)),
+            'cohorts': (t['upload']['analyzing_cohorts'], lambda: _compute_cohorts(data_key, df, customer_agg)),
+            'products': (t['upload']['analyzing_products'], lambda: _compute_products(data_key, df)),
+            'anomalies': (t['upload']['detecting_anomalies'], lambda: _compute_anomalies(data_key, df)),
+        }
+        pending = dict(jobs)
         
-        # 1. KPIs
-        status_text.text(t['upload']['analyzing_kpis'])
-        try:
-            # Get currency from validation results, or use None for generic
-            currency = None
-            if 'currency_info' in st.session_state:
-                currency = st.session_state.currency_info.get('default_currency')
-            logger.info(f"💰 Using currency for KPIs: {currency}")
-            
-            # Clean dataframe before KPI calculation
-            df_for_kpis = df.copy()
-            
-            # Ensure numeric columns are actually numeric
-            numeric_cols = ['order_total', 'quantity', 'shipping', 'taxes', 'refund_amount']
-            for col in numeric_cols:
-                if col in df_for_kpis.columns:
-                    df_for_kpis[col] = pd.to_numeric(df_for_kpis[col], errors='coerce')
-            
-            # Remove completely invalid rows
-            df_for_kpis = df_for_kpis[df_for_kpis['order_total'].notna()]
-            
-            logger.info(f"📊 Calculating KPIs on {len(df_for_kpis)} valid orders")
-            
-            kpi_calc = KPICalculator()
-            kpis = kpi_calc.calculate_all_kpis(df_for_kpis, currency=currency)
-            st.session_state.analysis_results['kpis'] = kpis
-            progress_bar.progress(0.2)
-        except Exception as e:
-            logger.error(f"KPI calculation failed: {e}", exc_info=True)
-            
-            # Show detailed error information
-            error_msg = str(e)
-            if "Could not convert" in error_msg and "to numeric" in error_msg:
-                st.error(f"❌ Data Quality Issue: Some columns contain invalid data that can't be processed as numbers.")
-                st.info("💡 **Tip**: Check that numeric columns (order total, quantity, etc.) contain only numbers, not text.")
-            else:
-                st.error(f"❌ KPI calculation failed: {str(e)}")
-            
-            st.session_state.analysis_results['kpis'] = {}
-            progress_bar.progress(0.2)
+        # Seed every stage with its empty result in one session-state write;
+        # stages only overwrite their entry on success
+        results = {
+            'kpis': {},
+            'rfm': {},
+            'cohorts': {},
+            'products': copy.deepcopy(_PRODUCT_EMPTY),
+            'anomalies': copy.deepcopy(_ANOMALY_EMPTY),
+        }
+        st.session_state.analysis_results = results
         
-        # 2. RFM
-        status_text.text(t['upload']['analyzing_rfm'])
-        try:
-            rfm_analyzer = RFMAnalyzer()
-            rfm_df = rfm_analyzer.calculate_rfm_scores(df)
-            
-            # Get segment summary and heatmap data
-            segment_summary = rfm_analyzer.get_segment_summary(rfm_df)
-            heatmap_data = rfm_analyzer.get_rfm_heatmap_data(rfm_df)
-            
-            # Store complete RFM results
-            st.session_state.analysis_results['rfm'] = {
-                'rfm_data': rfm_df,
-                'segment_summary': segment_summary,
-                'heatmap_data': heatmap_data
-            }
-            progress_bar.progress(0.4)
-        except Exception as e:
-            logger.error(f"RFM analysis failed: {e}", exc_info=True)
-            st.error(f"❌ RFM analysis failed: {str(e)}")
-            st.session_state.analysis_results['rfm'] = {}
-            progress_bar.progress(0.4)
+        def render_progress(done: int) -> None:
+            bar = "▰" * done + "▱" * (len(jobs) - done)
+            running = " · ".join(label for label, _ in pending.values())
+            progress_slot.markdown(f"{bar} **{done * 100 // len(jobs)}%**\n\n{running}")
         
-        # 3. Cohorts
-        status_text.text(t['upload']['analyzing_cohorts'])
-        try:
-            cohort_analyzer = CohortAnalyzer()
-            cohort_results = cohort_analyzer.perform_cohort_analysis(df)
-            st.session_state.analysis_results['cohorts'] = cohort_results
-            progress_bar.progress(0.6)
-        except Exception as e:
-            logger.error(f"Cohort analysis failed: {e}", exc_info=True)
-            st.error(f"❌ Cohort analysis failed: {str(e)}")
-            st.session_state.analysis_results['cohorts'] = {}
-            progress_bar.progress(0.6)
-        
-        # 4. Products
-        status_text.text(t['upload']['analyzing_products'])
-        product_analyzer = ProductAnalyzer()
-        try:
-            product_results = product_analyzer.analyze_products(df)
-            st.session_state.analysis_results['products'] = product_results
-        except Exception as e:
-            logger.warning(f"Product analysis skipped: {e}")
-            st.session_state.analysis_results['products'] = {
-                'product_performance': {},
-                'category_analysis': {'available': False},
-                'market_basket': {'available': False},
-                'lifecycle_metrics': {'available': False},
-                'top_products': {},
-                'summary_stats': {},
-                'total_products': 0
-            }
-            st.info("ℹ️ Product analysis skipped - no product data available in file")
-        progress_bar.progress(0.8)
+        render_progress(0)
         
-        # 5. Anomalies
-        status_text.text(t['upload']['detecting_anomalies'])
-        anomaly_detector = AnomalyDetector()
-        try:
-            anomaly_results = anomaly_detector.detect_anomalies(df)
-            st.session_state.analysis_results['anomalies'] = anomaly_results
-        except Exception as e:
-            logger.warning(f"Anomaly detection failed: {e}")
-            st.session_state.analysis_results['anomalies'] = {
-                'revenue_anomalies': [],
-                'order_anomalies': [],
-                'summary': {'total_anomalies': 0}
-            }
-        progress_bar.progress(1.0)
+        # Attach the script run context to the workers; st.cache_data expects
+        # one and warns on every call without it
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(
+            max_workers=len(jobs),
+            initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+        ) as executor:
+            futures = {executor.submit(job): key for key, (_, job) in jobs.items()}
+            
+            for done, future in enumerate(as_completed(futures), start=1):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    _handle_analysis_failure(key, e)
+                
+                # Show only the analyzers still running
+                del pending[key]
+                render_progress(done)
         
         # Mark data as loaded
         st.session_state.data_loaded = True
+        st.session_state.analysis_fp = data_key
         logger.info(f"✅ data_loaded flag set to True. Analysis completed successfully.")
         
-        status_text.empty()
-        progress_bar.empty()
+        progress_slot.empty()
         
         # Don't show any UI here - let the parent function handle it
         # Just set the flag and return
         
     except Exception as e:
         logger.error(f"Error in analysis: {e}", exc_info=True)
-        status_text.empty()
-        progress_bar.empty()
+        progress_slot.empty()
         st.error(t['errors']['analysis_error'].format(error=str(e)))
\ No newline at end of file
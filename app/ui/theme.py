@@ -6,8 +6,13 @@ This module provides:
 - Theme consistency across the application
 """
 
+import re
 import streamlit as st
-from typing import Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
+
+from app.config import DEBUG_MODE
 
 # Design Tokens
 DESIGN_TOKENS: Dict[str, Any] = {
@@ -119,19 +124,63 @@ DESIGN_TOKENS: Dict[str, Any] = {
     },
 }
 
+# Read-only view handed out by get_theme_tokens(); the stylesheet is cached
+# on the assumption that the tokens never change at runtime
+_FROZEN_TOKENS = MappingProxyType(DESIGN_TOKENS)
 
-def inject_theme_css() -> None:
-    """Inject comprehensive theme CSS into the Streamlit app.
+# Token groups emitted as CSS variables, with their variable-name prefix
+# (e.g. spacing["xs"] -> --spacing-xs, colors["gray_50"] -> --gray-50)
+_CSS_VAR_GROUPS = {
+    "colors": "",
+    "spacing": "spacing-",
+    "radius": "radius-",
+    "shadow": "shadow-",
+    "typography": "",
+}
+
+# The :root variable block, built once at import from the fixed tokens
+_ROOT_VARS_CSS = "\n".join(
+    f"        --{prefix}{name.replace('_', '-')}: {value};"
+    for group, prefix in _CSS_VAR_GROUPS.items()
+    for name, value in DESIGN_TOKENS[group].items()
+)
+
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet.
     
-    This function should be called once at app startup to apply
-    the modern design system styling.
+    Spaces before ``:`` are kept since they are significant in selectors
+    (``div :hover`` is not ``div:hover``).
+    
+    Args:
+        css: Stylesheet source
+        
+    Returns:
+        Minified stylesheet
+    """
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+@lru_cache(maxsize=1)
+def _build_theme_css() -> str:
+    """Build the theme stylesheet from the design tokens.
+    
+    DESIGN_TOKENS is fixed at runtime, so the string is built once per
+    process; call ``_build_theme_css.cache_clear()`` if tokens are changed.
+    
+    The result is minified to cut the bytes sent to the browser on every
+    rerun; with SALLA_DEBUG=1 the readable source is injected instead.
+    
+    Returns:
+        The ``<style>`` block to inject
     """
     tokens = DESIGN_TOKENS
     colors = tokens["colors"]
-    spacing = tokens["spacing"]
-    radius = tokens["radius"]
-    shadow = tokens["shadow"]
-    typo = tokens["typography"]
     
     css = f"""
     <style>
@@ -139,63 +188,7 @@ def inject_theme_css() -> None:
        CSS Variables for Theme Consistency
        ============================================ */
     :root {{
-        /* Colors */
-        --primary: {colors['primary']};
-        --primary-dark: {colors['primary_dark']};
-        --secondary: {colors['secondary']};
-        --secondary-dark: {colors['secondary_dark']};
-        --success: {colors['success']};
-        --success-bg: {colors['success_bg']};
-        --warning: {colors['warning']};
-        --warning-bg: {colors['warning_bg']};
-        --error: {colors['error']};
-        --error-bg: {colors['error_bg']};
-        --info: {colors['info']};
-        --info-bg: {colors['info_bg']};
-        
-        /* Neutral colors */
-        --gray-50: {colors['gray_50']};
-        --gray-100: {colors['gray_100']};
-        --gray-200: {colors['gray_200']};
-        --gray-300: {colors['gray_300']};
-        --gray-400: {colors['gray_400']};
-        --gray-500: {colors['gray_500']};
-        --gray-600: {colors['gray_600']};
-        --gray-700: {colors['gray_700']};
-        --gray-800: {colors['gray_800']};
-        --gray-900: {colors['gray_900']};
-        
-        /* Spacing */
-        --spacing-xs: {spacing['xs']};
-        --spacing-sm: {spacing['sm']};
-        --spacing-md: {spacing['md']};
-        --spacing-lg: {spacing['lg']};
-        --spacing-xl: {spacing['xl']};
-        --spacing-2xl: {spacing['2xl']};
-        
-        /* Border radius */
-        --radius-sm: {radius['sm']};
-        --radius-md: {radius['md']};
-        --radius-lg: {radius['lg']};
-        --radius-xl: {radius['xl']};
-        --radius-2xl: {radius['2xl']};
-        
-        /* Shadows */
-        --shadow-sm: {shadow['sm']};
-        --shadow-md: {shadow['md']};
-        --shadow-lg: {shadow['lg']};
-        --shadow-card: {shadow['card']};
-        --shadow-hover: {shadow['hover']};
-        
-        /* Typography */
-        --font-family: {typo['font_family']};
-        --font-size-xs: {typo['font_size_xs']};
-        --font-size-sm: {typo['font_size_sm']};
-        --font-size-base: {typo['font_size_base']};
-        --font-size-lg: {typo['font_size_lg']};
-        --font-size-xl: {typo['font_size_xl']};
-        --font-size-2xl: {typo['font_size_2xl']};
-        --font-size-3xl: {typo['font_size_3xl']};
+{_ROOT_VARS_CSS}
     }}
     
     /* ============================================
@@ -826,13 +819,22 @@ def inject_theme_css() -> None:
     </style>
     """
     
-    st.markdown(css, unsafe_allow_html=True)
+    return css if DEBUG_MODE else _minify_css(css)
+
+
+def inject_theme_css() -> None:
+    """Inject comprehensive theme CSS into the Streamlit app.
+    
+    This function should be called once at app startup to apply
+    the modern design system styling.
+    """
+    st.markdown(_build_theme_css(), unsafe_allow_html=True)
 
 
-def get_theme_tokens() -> Dict[str, Any]:
+def get_theme_tokens() -> Mapping[str, Any]:
     """Get the design tokens dictionary.
     
     Returns:
-        Dictionary containing all design tokens
+        Read-only view of all design tokens
     """
-    return DESIGN_TOKENS
+    return _FROZEN_TOKENS
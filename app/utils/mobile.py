@@ -1,7 +1,56 @@
 """Mobile detection and responsive layout utilities."""
 
 import streamlit as st
-from typing import Tuple, Optional, List
+from types import MappingProxyType
+from typing import Any, Tuple, Optional, List, Mapping
+
+# Compact metric card markup used on mobile, with and without a delta row
+_MOBILE_CARD_TPL = (
+    '<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); '
+    'padding: 12px; border-radius: 8px; margin-bottom: 8px; color: white;">'
+    '<div style="font-size: 11px; opacity: 0.9; margin-bottom: 4px;">{label}</div>'
+    '<div style="font-size: 20px; font-weight: bold;">{value}</div>'
+    '</div>'
+)
+_MOBILE_CARD_TPL_DELTA = (
+    '<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); '
+    'padding: 12px; border-radius: 8px; margin-bottom: 8px; color: white;">'
+    '<div style="font-size: 11px; opacity: 0.9; margin-bottom: 4px;">{label}</div>'
+    '<div style="font-size: 20px; font-weight: bold;">{value}</div>'
+    '<div style="font-size: 12px; margin-top: 4px;">{delta}</div>'
+    '</div>'
+)
+
+# Layout settings returned by get_mobile_layout_config()
+_MOBILE_LAYOUT = MappingProxyType({
+    'show_sidebar_by_default': False,
+    'use_single_column': True,
+    'chart_height': 300,
+    'table_page_size': 5,
+    'hide_complex_charts': True,
+    'simplified_navigation': True
+})
+_DESKTOP_LAYOUT = MappingProxyType({
+    'show_sidebar_by_default': True,
+    'use_single_column': False,
+    'chart_height': 400,
+    'table_page_size': 10,
+    'hide_complex_charts': False,
+    'simplified_navigation': False
+})
+
+# Plotly configs returned by mobile_friendly_chart_config(); st.plotly_chart
+# copies the config it is given, so sharing one mapping is safe
+_MOBILE_PLOTLY_CONFIG = MappingProxyType({
+    'displayModeBar': False,  # Hide toolbar on mobile
+    'responsive': True,
+    'displaylogo': False,
+})
+_DESKTOP_PLOTLY_CONFIG = MappingProxyType({
+    'displayModeBar': True,
+    'displaylogo': False,
+    'modeBarButtonsToRemove': ('pan2d', 'lasso2d', 'select2d'),
+})
 
 
 def is_mobile() -> bool:
@@ -10,13 +59,20 @@ def is_mobile() -> bool:
     
     This is a heuristic based on typical mobile screen widths.
     Streamlit doesn't have direct device detection, so we use JavaScript injection.
+    The result is cached in session state; inject_screen_detector resets it
+    whenever the detected width changes.
     """
-    # Try to get screen width from session state if already detected
-    if 'screen_width' in st.session_state:
-        return st.session_state.screen_width < 768
-    
-    # Default to False (assume desktop) if not detected
-    return False
+    mobile = st.session_state.get('_is_mobile')
+    if mobile is None:
+        # Default to desktop if the width hasn't been detected
+        mobile = st.session_state.get('screen_width', 1920) < 768
+        st.session_state['_is_mobile'] = mobile
+    return mobile
+
+
+def _reset_mobile_cache():
+    """Drop the cached is_mobile() result after the screen width changes."""
+    st.session_state.pop('_is_mobile', None)
 
 
 def get_responsive_columns(desktop_cols: int = 3, tablet_cols: int = 2, mobile_cols: int = 1) -> int:
@@ -59,33 +115,17 @@ def inject_screen_detector():
             st.session_state.screen_width = 1920
         except:
             st.session_state.screen_width = 1920
+        _reset_mobile_cache()
 
 
-def get_mobile_layout_config() -> dict:
+def get_mobile_layout_config() -> Mapping[str, Any]:
     """
     Get layout configuration for mobile devices.
     
     Returns:
-        Dictionary with layout settings
+        Read-only mapping with layout settings
     """
-    if is_mobile():
-        return {
-            'show_sidebar_by_default': False,
-            'use_single_column': True,
-            'chart_height': 300,
-            'table_page_size': 5,
-            'hide_complex_charts': True,
-            'simplified_navigation': True
-        }
-    else:
-        return {
-            'show_sidebar_by_default': True,
-            'use_single_column': False,
-            'chart_height': 400,
-            'table_page_size': 10,
-            'hide_complex_charts': False,
-            'simplified_navigation': False
-        }
+    return _MOBILE_LAYOUT if is_mobile() else _DESKTOP_LAYOUT
 
 
 def mobile_metric_card(label: str, value: str, delta: Optional[str] = None, help_text: Optional[str] = None):
@@ -100,61 +140,63 @@ def mobile_metric_card(label: str, value: str, delta: Optional[str] = None, help
     """
     if is_mobile():
         # Compact mobile layout
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 12px;
-            border-radius: 8px;
-            margin-bottom: 8px;
-            color: white;
-        ">
-            <div style="font-size: 11px; opacity: 0.9; margin-bottom: 4px;">{label}</div>
-            <div style="font-size: 20px; font-weight: bold;">{value}</div>
-            {f'<div style="font-size: 12px; margin-top: 4px;">{delta}</div>' if delta else ''}
-        </div>
-        """, unsafe_allow_html=True)
+        template = _MOBILE_CARD_TPL_DELTA if delta else _MOBILE_CARD_TPL
+        st.markdown(template.format(label=label, value=value, delta=delta), unsafe_allow_html=True)
     else:
         # Standard desktop metric
         st.metric(label=label, value=value, delta=delta, help=help_text)
 
 
+def mobile_metric_row(cards: List[dict]):
+    """
+    Display several metric cards, batched into one element on mobile.
+    
+    Args:
+        cards: Dicts with mobile_metric_card arguments (label, value and
+            optionally delta, help_text)
+    """
+    if is_mobile():
+        # One markdown element for the whole row instead of one per card
+        html = "".join(
+            (_MOBILE_CARD_TPL_DELTA if card.get('delta') else _MOBILE_CARD_TPL).format(
+                label=card['label'], value=card['value'], delta=card.get('delta')
+            )
+            for card in cards
+        )
+        st.markdown(f'<div class="mobile-kpi-row">{html}</div>', unsafe_allow_html=True)
+    else:
+        for col, card in zip(st.columns(len(cards)), cards):
+            with col:
+                st.metric(
+                    label=card['label'], value=card['value'],
+                    delta=card.get('delta'), help=card.get('help_text')
+                )
+
+
 def responsive_columns(*ratios) -> List:
     """
     Create responsive columns that collapse to single column on mobile.
     
+    Streamlit already stacks columns vertically on narrow viewports, so the
+    browser handles the mobile layout and no server-side check is needed.
+    
     Args:
         *ratios: Column ratios (e.g., 1, 2, 1 for three columns)
     
     Returns:
         List of column objects
     """
-    if is_mobile():
-        # On mobile, return single column
-        return [st.container()]
-    else:
-        # On desktop, use specified ratios
-        return st.columns(ratios)
+    return st.columns(ratios)
 
 
-def mobile_friendly_chart_config() -> dict:
+def mobile_friendly_chart_config() -> Mapping[str, Any]:
     """
     Get Plotly chart configuration optimized for mobile.
     
     Returns:
-        Dictionary of Plotly config options
+        Read-only mapping of Plotly config options
     """
-    if is_mobile():
-        return {
-            'displayModeBar': False,  # Hide toolbar on mobile
-            'responsive': True,
-            'displaylogo': False,
-        }
-    else:
-        return {
-            'displayModeBar': True,
-            'displaylogo': False,
-            'modeBarButtonsToRemove': ['pan2d', 'lasso2d', 'select2d'],
-        }
+    return _MOBILE_PLOTLY_CONFIG if is_mobile() else _DESKTOP_PLOTLY_CONFIG
 
 
 def show_mobile_tip():
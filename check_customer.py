@@ -1,14 +1,24 @@
 """Simple debug script - check for customer_id column."""
-import pandas as pd
+import sys
+
+from openpyxl import load_workbook
 
 file_path = r'c:\Users\omarr\Downloads\E Commerce Dashboard.xlsx'
-df = pd.read_excel(file_path, nrows=5)
 
-print("All columns:")
-for i, col in enumerate(df.columns):
-    print(f"  {i}: {col}")
+# Only the header row is needed; read-only mode streams it without parsing the sheet
+wb = load_workbook(file_path, read_only=True, data_only=True)
+try:
+    columns = [str(col) for col in next(wb.active.iter_rows(max_row=1, values_only=True))]
+finally:
+    wb.close()
+
+# Build the report and write it once instead of printing line by line
+lines = ["All columns:"]
+lines.extend(f"  {i}: {col}" for i, col in enumerate(columns))
 
-print("\nChecking for customer-related columns:")
-for col in df.columns:
-    if 'customer' in col.lower() or 'user' in col.lower() or 'client' in col.lower():
-        print(f"  FOUND: {col}")
+lines.append("\nChecking for customer-related columns:")
+lines.extend(
+    f"  FOUND: {col}" for col in columns
+    if 'customer' in col.lower() or 'user' in col.lower() or 'client' in col.lower()
+)
+sys.stdout.write("\n".join(lines) + "\n")
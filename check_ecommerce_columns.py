@@ -1,14 +1,26 @@
-import pandas as pd
+import sys
 
-df = pd.read_excel(r'c:\Users\omarr\Downloads\E Commerce Dashboard.xlsx', nrows=10)
+from openpyxl import load_workbook
 
-print('Total columns:', len(df.columns))
-print('\nColumn names:')
-for i, col in enumerate(df.columns, 1):
-    print(f'{i:2d}. {col}')
+# Header plus 10 data rows, streamed in read-only mode
+wb = load_workbook(r'c:\Users\omarr\Downloads\E Commerce Dashboard.xlsx', read_only=True, data_only=True)
+try:
+    rows = list(wb.active.iter_rows(max_row=11, values_only=True))
+finally:
+    wb.close()
 
-print('\n\nFirst 3 rows:')
-print(df.head(3))
+columns = [str(col) for col in rows[0]]
+data = rows[1:]
 
-print('\n\nColumn data types:')
-print(df.dtypes)
+# Build the report and write it once instead of printing line by line
+lines = [f'Total columns: {len(columns)}', '\nColumn names:']
+lines.extend(f'{i:2d}. {col}' for i, col in enumerate(columns, 1))
+
+lines.append('\n\nFirst 3 rows:')
+lines.extend(str(dict(zip(columns, row))) for row in data[:3])
+
+lines.append('\n\nColumn data types:')
+for i, col in enumerate(columns):
+    types = sorted({type(row[i]).__name__ for row in data if row[i] is not None})
+    lines.append(f'{col}: {", ".join(types) or "empty"}')
+sys.stdout.write('\n'.join(lines) + '\n')
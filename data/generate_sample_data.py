@@ -4,44 +4,66 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
-import random
+import sys
+from typing import Optional
 
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
+# Random seed for reproducibility
+SEED = 42
 
-def generate_sample_data(num_orders: int = 500, num_customers: int = 100) -> pd.DataFrame:
+# Discrete distributions as (values, cumulative probabilities), so sampling
+# is one uniform draw plus a searchsorted lookup per array
+_ITEMS_PER_ORDER = (np.array([1, 2, 3, 4, 5]), np.cumsum([0.5, 0.25, 0.15, 0.07, 0.03]))
+_QUANTITY = (np.array([1, 2, 3]), np.cumsum([0.7, 0.2, 0.1]))
+_ORDER_STATUS = (
+    np.array(['completed', 'completed', 'completed', 'completed', 'pending', 'cancelled'], dtype=object),
+    np.cumsum([0.85, 0.05, 0.05, 0.03, 0.01, 0.01])
+)
+_PAYMENT_METHOD = (
+    np.array(['credit_card', 'debit_card', 'cash_on_delivery'], dtype=object),
+    np.cumsum([0.5, 0.3, 0.2])
+)
+_SHIPPING_CITY = (
+    np.array(['Riyadh', 'Jeddah', 'Dammam', 'Mecca', 'Medina'], dtype=object),
+    np.cumsum([0.4, 0.3, 0.15, 0.1, 0.05])
+)
+
+def _sample(rng: np.random.Generator, distribution: tuple, size: int) -> np.ndarray:
+    """Draw size values from a (values, cdf) distribution."""
+    values, cdf = distribution
+    idx = np.searchsorted(cdf, rng.random(size), side='right')
+    # Guard against the cdf summing to slightly under 1
+    return values[np.minimum(idx, len(values) - 1)]
+
+def generate_sample_data(
+    num_orders: int = 500,
+    num_customers: int = 100,
+    rng: Optional[np.random.Generator] = None
+) -> pd.DataFrame:
     """Generate synthetic Salla order data.
     
     Args:
         num_orders: Number of orders to generate
         num_customers: Number of unique customers
+        rng: Random generator to draw from (seeded with SEED if not given)
         
     Returns:
         DataFrame with sample order data
     """
+    if rng is None:
+        rng = np.random.default_rng(np.random.SeedSequence(SEED))
+    
     # Date range: last 12 months
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365)
     
-    # Generate dates with more recent orders
-    dates = []
-    for _ in range(num_orders):
-        days_ago = int(np.random.exponential(scale=100))
-        if days_ago > 365:
-            days_ago = 365
-        order_date = end_date - timedelta(days=days_ago)
-        dates.append(order_date)
+    # Generate dates with more recent orders, as YYYY-MM-DD strings
+    days_ago = np.minimum(rng.exponential(scale=100, size=num_orders), 365).astype('int64')
+    order_dates = (np.datetime64(end_date.date()) - days_ago.astype('timedelta64[D]')).astype(str)
     
     # Customer IDs (some customers order multiple times)
-    customer_weights = np.random.zipf(1.5, num_customers)
-    customer_weights = customer_weights / customer_weights.sum()
-    customer_ids = np.random.choice(
-        range(1000, 1000 + num_customers),
-        size=num_orders,
-        p=customer_weights,
-        replace=True
-    )
+    customer_weights = rng.zipf(1.5, num_customers)
+    customer_cdf = np.cumsum(customer_weights / customer_weights.sum())
+    customer_ids = _sample(rng, (np.arange(1000, 1000 + num_customers), customer_cdf), num_orders)
     
     # Products
     products = [
@@ -62,76 +84,98 @@ def generate_sample_data(num_orders: int = 500, num_customers: int = 100) -> pd.
         ('Gaming Mouse RGB', 'Electronics', 149.00),
     ]
     
-    # Generate orders
-    orders = []
-    for i in range(num_orders):
-        order_id = f"ORD{10000 + i}"
-        customer_id = f"CUST{customer_ids[i]}"
-        order_date = dates[i]
-        
-        # Random number of items per order (1-5)
-        num_items = np.random.choice([1, 2, 3, 4, 5], p=[0.5, 0.25, 0.15, 0.07, 0.03])
-        
-        # Select random products
-        order_products = random.sample(products, min(num_items, len(products)))
-        
-        order_total = 0
-        for product_name, category, base_price in order_products:
-            # Add some price variation
-            price = base_price * np.random.uniform(0.9, 1.1)
-            quantity = np.random.choice([1, 2, 3], p=[0.7, 0.2, 0.1])
-            unit_price = price
-            line_total = price * quantity
-            order_total += line_total
-            
-            # Order status (mostly completed)
-            status = np.random.choice(
-                ['completed', 'completed', 'completed', 'completed', 'pending', 'cancelled'],
-                p=[0.85, 0.05, 0.05, 0.03, 0.01, 0.01]
-            )
-            
-            orders.append({
-                'order_id': order_id,
-                'order_date': order_date.strftime('%Y-%m-%d'),
-                'customer_id': customer_id,
-                'customer_name': f"Customer {customer_ids[i]}",
-                'customer_email': f"customer{customer_ids[i]}@example.com",
-                'customer_phone': f"+966{random.randint(500000000, 599999999)}",
-                'product_name': product_name,
-                'category': category,
-                'quantity': quantity,
-                'unit_price': round(unit_price, 2),
-                'line_total': round(line_total, 2),
-                'order_total': round(order_total, 2),
-                'order_status': status,
-                'currency': 'SAR',
-                'payment_method': np.random.choice(['credit_card', 'debit_card', 'cash_on_delivery'], p=[0.5, 0.3, 0.2]),
-                'shipping_city': np.random.choice(['Riyadh', 'Jeddah', 'Dammam', 'Mecca', 'Medina'], p=[0.4, 0.3, 0.15, 0.1, 0.05])
-            })
-    
-    df = pd.DataFrame(orders)
+    # Random number of items per order (1-5)
+    items_per_order = _sample(rng, _ITEMS_PER_ORDER, num_orders)
+    
+    # Select distinct random products for every order at once: shuffle the
+    # product indices per row and keep the first items_per_order[i] of each
+    product_rank = np.argsort(rng.random((num_orders, len(products))), axis=1)
+    product_idx = product_rank[np.arange(len(products)) < items_per_order[:, None]]
+    product_names, categories, base_prices = (np.array(col) for col in zip(*products))
+    
+    # Build the frame column by column: order-level values are expanded to
+    # one entry per line item, item-level values fill preallocated arrays
+    order_ids = np.char.add('ORD', np.arange(10000, 10000 + num_orders).astype(str))
+    customer_keys = customer_ids.astype(str)
+    num_rows = int(items_per_order.sum())
+    quantities = _sample(rng, _QUANTITY, num_rows)
+    
+    # Status, payment and shipping belong to the order, so draw them once per
+    # order and give every line item its order's values
+    statuses = np.repeat(_sample(rng, _ORDER_STATUS, num_orders), items_per_order)  # Mostly completed
+    payment_methods = np.repeat(_sample(rng, _PAYMENT_METHOD, num_orders), items_per_order)
+    shipping_cities = np.repeat(_sample(rng, _SHIPPING_CITY, num_orders), items_per_order)
+    
+    # Add some price variation
+    unit_prices = base_prices[product_idx] * rng.uniform(0.9, 1.1, size=num_rows)
+    line_totals = unit_prices * quantities
+    phones = np.char.add('+966', rng.integers(500000000, 600000000, size=num_rows).astype(str))
+    
+    # Every line item carries its order's full total, as in real exports
+    order_starts = np.cumsum(items_per_order) - items_per_order
+    order_totals = np.repeat(np.add.reduceat(line_totals, order_starts), items_per_order)
+    
+    # Round the money columns once, over whole arrays
+    for money in (unit_prices, line_totals, order_totals):
+        np.round(money, 2, out=money)
+    
+    df = pd.DataFrame({
+        'order_id': np.repeat(order_ids, items_per_order),
+        'order_date': np.repeat(order_dates, items_per_order),
+        'customer_id': np.repeat(np.char.add('CUST', customer_keys), items_per_order),
+        'customer_name': np.repeat(np.char.add('Customer ', customer_keys), items_per_order),
+        'customer_email': np.repeat(np.char.add(np.char.add('customer', customer_keys), '@example.com'), items_per_order),
+        'customer_phone': phones,
+        'product_name': product_names[product_idx],
+        'category': categories[product_idx],
+        'quantity': quantities,
+        'unit_price': unit_prices,
+        'line_total': line_totals,
+        'order_total': order_totals,
+        'order_status': statuses,
+        'currency': 'SAR',
+        'payment_method': payment_methods,
+        'shipping_city': shipping_cities,
+    })
+    
+    # Low-cardinality labels as categoricals: int8 codes instead of one
+    # Python string per row
+    for col in ('category', 'order_status', 'payment_method', 'shipping_city', 'currency'):
+        df[col] = df[col].astype('category')
     
     # Add some Arabic headers as synonyms (in comment for reference)
     # Original headers can be in Arabic: رقم_الطلب, تاريخ_الطلب, etc.
     
     return df
 
-def main():
-    """Generate and save sample data."""
+def main(output_format: str = 'xlsx'):
+    """Generate and save sample data.
+    
+    Args:
+        output_format: 'xlsx' for a file the app can upload, or 'csv' for a
+            much faster write when the data is only used by scripts
+    """
+    if output_format not in ('xlsx', 'csv'):
+        raise ValueError(f"Unsupported output format: {output_format}")
+    
     print("Generating sample Salla data...")
     
     # Generate data with 20,000 orders to match real Salla exports
     df = generate_sample_data(num_orders=20000, num_customers=500)
     
-    # Save to Excel
-    output_path = Path(__file__).parent / 'sample_salla_orders.xlsx'
-    df.to_excel(output_path, index=False, engine='openpyxl')
+    output_path = Path(__file__).parent / f'sample_salla_orders.{output_format}'
+    if output_format == 'csv':
+        df.to_csv(output_path, index=False)
+    else:
+        # Save to Excel; xlsxwriter streams the XML directly and is much faster
+        # than openpyxl's in-memory cell model for a sheet this size
+        df.to_excel(output_path, index=False, engine='xlsxwriter')
     
     print(f"✅ Sample data generated: {output_path}")
     print(f"   - Total orders: {len(df)}")
     print(f"   - Unique customers: {df['customer_id'].nunique()}")
     print(f"   - Date range: {df['order_date'].min()} to {df['order_date'].max()}")
-    print(f"   - Total revenue: SAR {df['order_total'].sum():,.2f}")
+    print(f"   - Total revenue: SAR {df.drop_duplicates('order_id')['order_total'].sum():,.2f}")
     print(f"   - Products: {df['product_name'].nunique()}")
     print(f"   - Categories: {df['category'].nunique()}")
     
@@ -140,4 +184,4 @@ def main():
     print(df.head(3))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main(sys.argv[1] if len(sys.argv) > 1 else 'xlsx')
\ No newline at end of file
@@ -82,6 +82,20 @@ def test_clean_concatenated_columns():
     print("\n✅ All _clean_concatenated_columns tests passed!")
 
 
+def test_clean_concatenated_columns_min_length():
+    """Test that only values longer than 20 characters are cleaned."""
+    df = pd.DataFrame({
+        'country': [
+            'BahrainBahrainBahrainBahrainBahrain',
+            'QatarQatarQatarQatar',  # Exactly 20 characters
+        ]
+    })
+    
+    df_clean = _clean_concatenated_columns(df)
+    
+    assert df_clean['country'].tolist() == ['Bahrain', 'QatarQatarQatarQatar']
+
+
 def test_real_world_scenario():
     """Test with realistic data corruption scenario."""
     
@@ -91,11 +91,12 @@ def test_export():
         print(f"\n✅ SUCCESS! Export saved to: {output_file.absolute()}")
         print(f"File size: {output_file.stat().st_size / 1024:.1f} KB")
         
-        # Verify sheets
-        test_df = pd.ExcelFile(output_file)
-        print(f"\nSheets created: {len(test_df.sheet_names)}")
-        for sheet in test_df.sheet_names:
-            print(f"  - {sheet}")
+        # Verify sheets from the in-memory workbook instead of re-reading the file
+        excel_buffer.seek(0)
+        with pd.ExcelFile(excel_buffer) as report:
+            print(f"\nSheets created: {len(report.sheet_names)}")
+            for sheet in report.sheet_names:
+                print(f"  - {sheet}")
         
         return True
         
@@ -32,8 +32,10 @@ mappings = {
     'order_total': 'item_price'
 }
 
-# Rename columns
-df_renamed = df.rename(columns={v: k for k, v in mappings.items()})
+# Rename columns by relabelling the index in place; rename() would copy every column
+inverse = {v: k for k, v in mappings.items()}
+df.columns = [inverse.get(c, c) for c in df.columns]
+df_renamed = df
 
 print("Detecting data level...")
 aggregator = DataAggregator()
@@ -1,13 +1,34 @@
 """Test mapper validation with Germany data."""
 
 import sys
+import importlib.util
+from pathlib import Path
 sys.path.insert(0, r'd:\Advanced Analysis for Salla')
 
 import pandas as pd
 from app.ingestion.mapper import ColumnMapper
 
+DATA_FILE = Path(r'c:\Users\omarr\Downloads\Germany e-commerce data.xlsx\Germany e-commerce data.xlsx')
+# calamine parses xlsx in Rust; fall back to openpyxl when it isn't installed
+ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else 'openpyxl'
+# Arrow-backed columns hold strings in one buffer instead of a Python
+# object per cell
+DTYPE_BACKEND = 'pyarrow'
+# The 1000-row slice is kept in the repo's (gitignored) .cache/ so reruns
+# skip the xlsx parse without writing next to the workbook; the name
+# carries the read settings so a slice read another way is never reused
+CACHE_FILE = (
+    Path(__file__).parent / '.cache'
+    / f'{DATA_FILE.stem}.head1000.{ENGINE}.{DTYPE_BACKEND}.pkl'
+)
+
 print("Loading Germany e-commerce data (first 1000 rows)...")
-df = pd.read_excel(r'c:\Users\omarr\Downloads\Germany e-commerce data.xlsx\Germany e-commerce data.xlsx', nrows=1000)
+if CACHE_FILE.exists() and CACHE_FILE.stat().st_mtime >= DATA_FILE.stat().st_mtime:
+    df = pd.read_pickle(CACHE_FILE)
+else:
+    df = pd.read_excel(DATA_FILE, nrows=1000, engine=ENGINE, dtype_backend=DTYPE_BACKEND)
+    CACHE_FILE.parent.mkdir(exist_ok=True)
+    df.to_pickle(CACHE_FILE)
 
 print(f"✓ Loaded {len(df):,} rows")
 print(f"✓ Columns: {list(df.columns)}")
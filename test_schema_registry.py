@@ -15,6 +15,7 @@ import sys
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from app.ingestion import schema_registry
 from app.ingestion.schema_registry import SchemaRegistry
 from app.ingestion.mapper import ColumnMapper
 from app.config import CANONICAL_FIELDS
@@ -23,9 +24,9 @@ from app.config import CANONICAL_FIELDS
 class TestSchemaRegistry:
     """Test suite for SchemaRegistry class."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def registry(self):
-        """Create schema registry instance."""
+        """Create schema registry instance shared by the tests in this module."""
         return SchemaRegistry()
     
     def test_initialization(self, registry):
@@ -152,6 +153,24 @@ class TestSchemaRegistry:
         
         assert field_type == "float"
         assert confidence >= 0.8
+        
+        # Integers mixed with fractions widen to float
+        field_type, _ = registry.suggest_field_type("value", pd.Series([1, 2, 3.5]))
+        assert field_type == "float"
+    
+    def test_field_type_detection_name_hints_on_numeric(self, registry):
+        """Test that name hints win over a numeric dtype."""
+        field_type, confidence = registry.suggest_field_type(
+            "is_active",
+            pd.Series([0, 1, 1])
+        )
+        assert (field_type, confidence) == ("boolean", 0.9)
+        
+        field_type, confidence = registry.suggest_field_type(
+            "created_at",
+            pd.Series([1704067200, 1704153600, 1704240000])
+        )
+        assert (field_type, confidence) == ("datetime", 0.9)
     
     def test_field_type_detection_string(self, registry):
         """Test detecting string field type."""
@@ -165,6 +184,31 @@ class TestSchemaRegistry:
         assert field_type == "string"
         assert confidence >= 0.5
     
+    @pytest.mark.slow
+    def test_field_type_detection_large_series(self, registry, monkeypatch):
+        """Test that long columns are inferred from a bounded sample."""
+        sample_data = pd.Series([f"{i}.5" for i in range(500_000)])
+        
+        classified_sizes = []
+        classify_values = schema_registry._classify_values
+        
+        def record_classify(values):
+            classified_sizes.append(len(values))
+            return classify_values(values)
+        
+        monkeypatch.setattr(schema_registry, "_classify_values", record_classify)
+        
+        field_type, confidence = registry.suggest_field_type(
+            "value",
+            sample_data
+        )
+        
+        assert field_type == "float"
+        assert confidence >= 0.95
+        # Values are only ever classified from the sampled subset
+        assert classified_sizes
+        assert max(classified_sizes) <= schema_registry.MAX_SAMPLE_SIZE
+    
     def test_backward_compatibility(self, registry):
         """Test conversion to CANONICAL_FIELDS format."""
         canonical = registry.to_canonical_fields_dict("salla")
@@ -270,18 +314,23 @@ class TestColumnMapperDynamic:
 class TestMigration:
     """Test migration from static to dynamic schema."""
     
-    def test_same_field_count(self):
+    @pytest.fixture(scope="module")
+    def registry(self):
+        """Create schema registry instance shared by the migration tests."""
+        return SchemaRegistry()
+    
+    @pytest.fixture(scope="module")
+    def canonical(self, registry):
+        """Salla schema in CANONICAL_FIELDS format, built once for these tests."""
+        return registry.to_canonical_fields_dict("salla")
+    
+    def test_same_field_count(self, canonical):
         """Test dynamic schema has same fields as static CANONICAL_FIELDS."""
-        registry = SchemaRegistry()
-        canonical = registry.to_canonical_fields_dict("salla")
-        
         # Should have at least as many fields as CANONICAL_FIELDS
         assert len(canonical) >= len(CANONICAL_FIELDS) - 1  # Allow 1 field difference
     
-    def test_required_fields_match(self):
+    def test_required_fields_match(self, registry):
         """Test required fields match between static and dynamic."""
-        registry = SchemaRegistry()
-        
         # Get required from dynamic
         dynamic_required = set(registry.get_required_fields("salla"))
         
@@ -294,11 +343,8 @@ class TestMigration:
         # Should match exactly
         assert dynamic_required == static_required
     
-    def test_field_types_match(self):
+    def test_field_types_match(self, canonical):
         """Test field types match between static and dynamic."""
-        registry = SchemaRegistry()
-        canonical = registry.to_canonical_fields_dict("salla")
-        
         for field_name in CANONICAL_FIELDS.keys():
             if field_name in canonical:
                 # Type should match
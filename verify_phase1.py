@@ -3,6 +3,7 @@
 Run this to verify all imports work before launching the main app.
 """
 
+import importlib
 import sys
 from pathlib import Path
 
@@ -11,39 +12,43 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 print("🧪 Testing Phase 1 Implementation...\n")
 
-# Test 1: Import theme module
-try:
-    from app.ui.theme import inject_theme_css, get_theme_tokens, DESIGN_TOKENS
-    print("✅ Theme module imported successfully")
-    print(f"   - Design tokens available: {len(DESIGN_TOKENS)} categories")
-except Exception as e:
-    print(f"❌ Theme module import failed: {e}")
-    sys.exit(1)
-
-# Test 2: Import enhanced components
-try:
-    from app.ui.components import (
-        app_header, section, kpi, kpi_row, card, stepper,
-        language_toggle, empty_state, toast_success, toast_error,
-        skeleton_loader, badge, progress_bar
-    )
-    print("✅ Enhanced components imported successfully")
-    print("   - 13 modern components available")
-except Exception as e:
-    print(f"❌ Components import failed: {e}")
-    sys.exit(1)
+# Tests 1-3: Import UI modules and check the names each must export
+# (label, module, required names, detail line)
+MANIFEST = [
+    (
+        "Theme module", "app.ui.theme",
+        ["inject_theme_css", "get_theme_tokens", "DESIGN_TOKENS"],
+        lambda module, names: f"Design tokens available: {len(module.get_theme_tokens())} categories"
+    ),
+    (
+        "Enhanced components", "app.ui.components",
+        ["app_header", "section", "kpi", "kpi_row", "card", "stepper",
+         "language_toggle", "empty_state", "toast_success", "toast_error",
+         "skeleton_loader", "badge", "progress_bar"],
+        lambda module, names: f"{len(names)} modern components available"
+    ),
+    (
+        "Chart helpers", "app.ui.charts",
+        ["line_trend", "bar_compare", "pie_distribution", "cohort_heatmap",
+         "scatter_plot", "area_chart", "funnel_chart", "gauge_chart"],
+        lambda module, names: f"{len(names)} chart types available"
+    ),
+]
 
-# Test 3: Import chart helpers
-try:
-    from app.ui.charts import (
-        line_trend, bar_compare, pie_distribution, cohort_heatmap,
-        scatter_plot, area_chart, funnel_chart, gauge_chart
-    )
-    print("✅ Chart helpers imported successfully")
-    print("   - 8 chart types available")
-except Exception as e:
-    print(f"❌ Charts import failed: {e}")
-    sys.exit(1)
+for label, module_name, names, detail in MANIFEST:
+    try:
+        module = importlib.import_module(module_name)
+    except Exception as e:
+        print(f"❌ {label} import failed: {e}")
+        sys.exit(1)
+    
+    missing = [name for name in names if not hasattr(module, name)]
+    if missing:
+        print(f"❌ {label} is missing: {', '.join(missing)}")
+        sys.exit(1)
+    
+    print(f"✅ {label} imported successfully")
+    print(f"   - {detail(module, names)}")
 
 # Test 4: Verify config.toml
 try: